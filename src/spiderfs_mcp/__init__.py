@@ -21,6 +21,14 @@ def main() -> None:
         stream=sys.stderr,
     )
 
+    # Use libuv's event loop when available; it has lower per-task overhead
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
     # Run the server
     asyncio.run(serve())
 
@@ -0,0 +1,39 @@
+"""Thread pool shared by the file and search packages"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, TypeVar
+import functools
+import os
+
+# Worker cap for blocking file system work: the bulk APIs, the fallback
+# walk and the server's tool calls. File I/O releases the GIL, so a few
+# threads per core hide syscall latency; more than this only adds contention.
+IO_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@functools.lru_cache(maxsize=1)
+def io_executor() -> ThreadPoolExecutor:
+    """
+    Thread pool shared by every fan-out of file system work in the process
+
+    Created on first use and kept, so repeated calls reuse warm worker
+    threads instead of starting and joining a pool each time. Only leaf
+    tasks go here: a task waiting on others in the same pool could
+    deadlock it once every worker is doing the same.
+    """
+    return ThreadPoolExecutor(max_workers=IO_MAX_WORKERS, thread_name_prefix="spiderfs-io")
+
+
+def bulk_map(func: Callable[[T], R], items: Iterable[T]) -> List[R]:
+    """
+    Apply func to every item on the shared I/O pool, returning results in order
+
+    A single item is handled inline.
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    return list(io_executor().map(func, items))
@@ -1,14 +1,40 @@
 import sys
 import os
+import asyncio
+import inspect
 import json
+import fnmatch
+import functools
 import logging
+import re
+import stat
 
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from spiderfs_mcp.search.ripgrep import RipgrepSearch
 from spiderfs_mcp.file.reader import FileReader
 from spiderfs_mcp.file.writer import FileWriter
 
+# orjson is optional; its JSONDecodeError subclasses json.JSONDecodeError
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except (orjson.JSONEncodeError, TypeError):
+            # orjson rejects what json escapes, e.g. the surrogates
+            # os.fsdecode gives non-UTF-8 file names
+            return json.dumps(obj).encode("utf-8")
+
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 
 # Configure logging to file for debugging
 logging.basicConfig(
@@ -22,6 +48,45 @@ logger = logging.getLogger("spiderfs_mcp")
 logger.info("Successfully imported SpiderFsMcp modules")
 
 
+@functools.lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> "re.Pattern[str]":
+    """Compile a glob pattern to a regex; raises re.error if invalid"""
+    return re.compile(fnmatch.translate(pattern))
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_excludes(patterns: Tuple[str, ...]) -> Optional["re.Pattern[str]"]:
+    """
+    Fuse exclude globs into one alternation so each name is checked with a
+    single regex call. Returns None if there is nothing (valid) to exclude.
+    """
+    if not patterns:
+        return None
+    try:
+        return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+    except re.error:
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _join_base(base_dir: Path, path: str) -> str:
+    """
+    Join a request path onto the base directory
+
+    Absolute paths replace the base, as with pathlib's / operator. Request
+    paths repeat heavily, so results are cached.
+    """
+    return str(base_dir / path)
+
+
+def _stat_or_none(path: str) -> Optional[os.stat_result]:
+    """stat() a path once, returning None if it does not exist"""
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
 class MCPAdapter:
     """Adapter for SpiderFsMcp to work with MCP protocol"""
 
@@ -36,30 +101,19 @@ class MCPAdapter:
 
     def _resolve_path(self, path: str) -> str:
         """Resolve path relative to base directory"""
-        path_obj = Path(path)
-
-        # If path is absolute, check if it's within the base directory
-        if path_obj.is_absolute():
-            try:
-                path_obj.relative_to(self.base_dir)
-                return str(path_obj)
-            except ValueError:
-                # Path is outside base directory, use relative
-                pass
-
-        # Join with base directory
-        return str(self.base_dir / path)
+        return _join_base(self.base_dir, path)
 
     def read_file(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Read a file's content"""
         try:
             path = self._resolve_path(params.get("path", ""))
-            file_path = Path(path)
 
-            if not file_path.exists():
+            # One stat covers both the existence and the type check
+            st = _stat_or_none(path)
+            if st is None:
                 return {"error": f"File not found: {path}"}
 
-            if file_path.is_dir():
+            if stat.S_ISDIR(st.st_mode):
                 return {"error": f"Path is a directory, not a file: {path}"}
 
             # Use SpiderFsMcp's file reader if available
@@ -72,13 +126,25 @@ class MCPAdapter:
 
     def read_multiple_files(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Read multiple files at once"""
+        return asyncio.run(self.read_multiple_files_async(params))
+
+    async def read_multiple_files_async(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Read multiple files at once, concurrently in worker threads"""
         paths = params.get("paths", [])
         results = {}
 
-        for path in paths:
-            resolved_path = self._resolve_path(path)
-            result = self.read_file({"path": resolved_path})
-            if "content" in result:
+        read_results = await asyncio.gather(
+            *(
+                asyncio.to_thread(self.read_file, {"path": self._resolve_path(path)})
+                for path in paths
+            ),
+            return_exceptions=True,
+        )
+
+        for path, result in zip(paths, read_results):
+            if isinstance(result, Exception):
+                results[path] = {"error": str(result)}
+            elif "content" in result:
                 results[path] = {"content": result["content"]}
             else:
                 results[path] = {"error": result.get("error", "Unknown error")}
@@ -91,15 +157,13 @@ class MCPAdapter:
             path = self._resolve_path(params.get("path", ""))
             content = params.get("content", "")
 
-            # Use SpiderFsMcp's file writer replace_string method with empty old string to write the entire content
-            path_obj = Path(path)
-            if path_obj.exists():
-                result = self.file_writer.replace_string(path, path_obj.read_text(), content)
-            else:
-                # For new files, create directory if needed
-                path_obj.parent.mkdir(parents=True, exist_ok=True)
-                # Write content directly for new files
-                path_obj.write_text(content)
+            # For new files, create directory if needed
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+            # Overwrite directly; the old content never needs to be read
+            result = self.file_writer.write_file(path, content)
+            if not result.success:
+                return {"error": result.error}
 
             return {"success": True}
         except Exception as e:
@@ -110,18 +174,20 @@ class MCPAdapter:
         """List files and directories in a path"""
         try:
             path = self._resolve_path(params.get("path", ""))
-            dir_path = Path(path)
 
-            if not dir_path.exists():
+            st = _stat_or_none(path)
+            if st is None:
                 return {"error": f"Directory not found: {path}"}
 
-            if not dir_path.is_dir():
+            if not stat.S_ISDIR(st.st_mode):
                 return {"error": f"Path is not a directory: {path}"}
 
-            entries = []
-            for item in dir_path.iterdir():
-                entry_type = "FILE" if item.is_file() else "DIR"
-                entries.append(f"[{entry_type}] {item.name}")
+            # DirEntry caches the file type from readdir, avoiding a stat per entry
+            with os.scandir(path) as it:
+                entries = [
+                    f"[{'FILE' if entry.is_file() else 'DIR'}] {entry.name}"
+                    for entry in it
+                ]
 
             return {"entries": entries}
         except Exception as e:
@@ -145,38 +211,53 @@ class MCPAdapter:
             path = self._resolve_path(params.get("path", ""))
             dir_path = Path(path)
 
-            if not dir_path.exists():
+            st = _stat_or_none(path)
+            if st is None:
                 return {"error": f"Path not found: {path}"}
 
-            def build_tree(current_path):
-                """Recursively build tree structure"""
-                item = {
-                    "name": current_path.name,
-                    "type": "file" if current_path.is_file() else "directory",
-                }
-
-                if current_path.is_dir():
-                    children = []
-                    try:
-                        # Sort directories first, then files
-                        sorted_paths = sorted(
-                            current_path.iterdir(),
-                            key=lambda p: (0 if p.is_file() else 1, p.name.lower()),
-                        )
-                        for child_path in sorted_paths:
-                            # Skip hidden files and directories
-                            if not child_path.name.startswith("."):
-                                children.append(build_tree(child_path))
-                    except PermissionError:
-                        # Handle permission errors for restricted directories
-                        pass
-
-                    item["children"] = children
+            tree = {
+                "name": dir_path.name,
+                "type": "file" if stat.S_ISREG(st.st_mode) else "directory",
+            }
 
-                return item
+            # Walk iteratively: each stack item is a directory and the
+            # children list its node will hold. Nodes are appended to their
+            # parent as soon as they are seen, so sibling order is kept.
+            stack = []
+            if stat.S_ISDIR(st.st_mode):
+                tree["children"] = []
+                stack.append((path, tree["children"]))
 
-            result = build_tree(dir_path)
-            return {"tree": result}
+            while stack:
+                current_path, children = stack.pop()
+                try:
+                    # Sort files first, then directories; DirEntry reuses
+                    # the readdir file type instead of a stat per entry
+                    with os.scandir(current_path) as it:
+                        sorted_entries = sorted(
+                            it,
+                            key=lambda e: (0 if e.is_file() else 1, e.name.lower()),
+                        )
+                except PermissionError:
+                    # Handle permission errors for restricted directories
+                    continue
+
+                for entry in sorted_entries:
+                    # Skip hidden files and directories
+                    if entry.name.startswith("."):
+                        continue
+                    # Don't descend through symlinks (avoids cycles)
+                    if entry.is_dir(follow_symlinks=False):
+                        node = {"name": entry.name, "type": "directory", "children": []}
+                        stack.append((entry.path, node["children"]))
+                    else:
+                        node = {
+                            "name": entry.name,
+                            "type": "file" if entry.is_file() else "directory",
+                        }
+                    children.append(node)
+
+            return {"tree": tree}
         except Exception as e:
             logger.error(f"Error getting directory tree: {str(e)}")
             return {"error": str(e)}
@@ -206,40 +287,43 @@ class MCPAdapter:
         self, path: str, pattern: str, exclude_patterns: List[str] = []
     ) -> Dict[str, Any]:
         """Search files by name pattern using Python"""
-        import fnmatch
-        import re
-
-        dir_path = Path(path)
-        if not dir_path.exists() or not dir_path.is_dir():
+        st = _stat_or_none(path)
+        if st is None or not stat.S_ISDIR(st.st_mode):
             return {"error": f"Invalid directory: {path}"}
 
-        # Prepare exclude patterns as regex
-        exclude_regexes = []
-        if exclude_patterns:
-            for ex_pattern in exclude_patterns:
-                try:
-                    exclude_regexes.append(re.compile(fnmatch.translate(ex_pattern)))
-                except:
-                    pass
+        # Compiled regexes are cached across calls; order of excludes is irrelevant
+        exclude_regex = _compile_excludes(tuple(sorted(set(exclude_patterns))))
 
         # Convert glob pattern to regex
         try:
-            pattern_regex = re.compile(fnmatch.translate(pattern))
-        except:
+            pattern_regex = _compile_glob(pattern)
+        except re.error:
             return {"error": f"Invalid pattern: {pattern}"}
 
         matching_files = []
 
-        for root, dirs, files in os.walk(dir_path):
-            # Skip excluded directories
-            dirs[:] = [d for d in dirs if not any(r.match(d) for r in exclude_regexes)]
-
-            for filename in files:
-                if pattern_regex.match(filename) and not any(
-                    r.match(filename) for r in exclude_regexes
-                ):
-                    file_path = Path(root) / filename
-                    matching_files.append(str(file_path))
+        # Walk with scandir so file types come from the readdir cache
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        name = entry.name
+                        # Excluded directories are pruned before descending
+                        if exclude_regex is not None and exclude_regex.match(name):
+                            continue
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        elif pattern_regex.match(name):
+                            matching_files.append(entry.path)
+            except OSError:
+                # Unreadable directories are skipped, as os.walk does
+                continue
+            # Preserve top-down, in-order traversal
+            stack.extend(reversed(subdirs))
 
         return {"matches": matching_files}
 
@@ -249,17 +333,17 @@ class MCPAdapter:
             path = self._resolve_path(params.get("path", ""))
             file_path = Path(path)
 
-            if not file_path.exists():
+            # Every field below comes from this single stat
+            stat_info = _stat_or_none(path)
+            if stat_info is None:
                 return {"error": f"Path not found: {path}"}
 
-            stat_info = file_path.stat()
-
             info = {
                 "name": file_path.name,
                 "path": str(file_path),
                 "size": stat_info.st_size,
-                "is_file": file_path.is_file(),
-                "is_directory": file_path.is_dir(),
+                "is_file": stat.S_ISREG(stat_info.st_mode),
+                "is_directory": stat.S_ISDIR(stat_info.st_mode),
                 "created": stat_info.st_ctime,
                 "modified": stat_info.st_mtime,
                 "accessed": stat_info.st_atime,
@@ -275,6 +359,38 @@ class MCPAdapter:
         return {"directories": [str(self.base_dir)]}
 
 
+def _read_request_batches(fd: int) -> Iterator[List[bytes]]:
+    """
+    Yield the complete request lines available on fd, one batch per read
+
+    A batch holds every line the client had already sent when it was read,
+    so the responses to a burst of requests can go out in a single write.
+    """
+    pending = b""
+    while True:
+        data = os.read(fd, 64 * 1024)
+        if not data:
+            # EOF: a final line without a trailing newline is still a request
+            if pending:
+                yield [pending]
+            return
+        lines = (pending + data).split(b"\n")
+        pending = lines.pop()
+        if lines:
+            yield lines
+
+
+def _encode_response(response: Dict[str, Any]) -> bytes:
+    """Encode a response as a JSON line"""
+    return _json_dumps(response) + b"\n"
+
+
+def _write_responses(responses: List[bytes]) -> None:
+    """Write encoded responses to stdout with a single flush"""
+    sys.stdout.buffer.write(b"".join(responses))
+    sys.stdout.flush()
+
+
 def main():
     # Get base directory from command line args
     base_dir = sys.argv[1] if len(sys.argv) > 1 else os.getcwd()
@@ -282,63 +398,68 @@ def main():
     # Initialize MCP adapter
     adapter = MCPAdapter(base_dir)
 
-    # Process stdin for commands
-    for line in sys.stdin:
-        try:
-            request = json.loads(line)
-
-            # Extract the function name and parameters
-            func_name = request.get("function", "")
-            params = request.get("params", {})
-            request_id = request.get("id", "")
-
-            # Map function names to methods
-            func_map = {
-                "read_file": adapter.read_file,
-                "read_multiple_files": adapter.read_multiple_files,
-                "write_file": adapter.write_file,
-                "list_directory": adapter.list_directory,
-                "create_directory": adapter.create_directory,
-                "directory_tree": adapter.directory_tree,
-                "search_files": adapter.search_files,
-                "get_file_info": adapter.get_file_info,
-                "list_allowed_directories": adapter.list_allowed_directories,
-            }
-
-            # Call the appropriate function
-            if func_name in func_map:
-                result = func_map[func_name](params)
-            else:
-                result = {"error": f"Unknown function: {func_name}"}
-
-            # Construct the response
-            response = {"id": request_id, "result": result}
-
-            # Write the response to stdout
-            sys.stdout.write(json.dumps(response) + "\n")
-            sys.stdout.flush()
-
-        except json.JSONDecodeError:
-            logger.error(f"Invalid JSON: {line}")
-            # Send error response
-            sys.stdout.write(
-                json.dumps({"id": "", "result": {"error": "Invalid JSON request"}})
-                + "\n"
-            )
-            sys.stdout.flush()
-        except Exception as e:
-            logger.error(f"Error processing request: {str(e)}")
-            # Send error response
-            sys.stdout.write(
-                json.dumps(
-                    {
-                        "id": "",
-                        "result": {"error": f"Error processing request: {str(e)}"},
-                    }
+    # One loop for the session so async handlers reuse its worker threads
+    loop = asyncio.new_event_loop()
+
+    # Map function names to methods
+    func_map = {
+        "read_file": adapter.read_file,
+        "read_multiple_files": adapter.read_multiple_files_async,
+        "write_file": adapter.write_file,
+        "list_directory": adapter.list_directory,
+        "create_directory": adapter.create_directory,
+        "directory_tree": adapter.directory_tree,
+        "search_files": adapter.search_files,
+        "get_file_info": adapter.get_file_info,
+        "list_allowed_directories": adapter.list_allowed_directories,
+    }
+
+    # Process stdin for commands. Responses are flushed once per batch of
+    # pending requests rather than once per response; the client sends
+    # nothing further until it has read them, so none are held back.
+    for batch in _read_request_batches(sys.stdin.fileno()):
+        responses = []
+        for line in batch:
+            try:
+                request = _json_loads(line)
+
+                # Extract the function name and parameters
+                func_name = request.get("function", "")
+                params = request.get("params", {})
+                request_id = request.get("id", "")
+
+                # Call the appropriate function
+                if func_name in func_map:
+                    result = func_map[func_name](params)
+                    if inspect.isawaitable(result):
+                        result = loop.run_until_complete(result)
+                else:
+                    result = {"error": f"Unknown function: {func_name}"}
+
+                # Construct the response; encoding it here lets a result
+                # that cannot be serialized fail only its own request
+                responses.append(_encode_response({"id": request_id, "result": result}))
+
+            except json.JSONDecodeError:
+                logger.error(f"Invalid JSON: {line.decode('utf-8', 'replace')}")
+                # Send error response
+                responses.append(_encode_response({"id": "", "result": {"error": "Invalid JSON request"}}))
+            except Exception as e:
+                logger.error(f"Error processing request: {str(e)}")
+                # Send error response
+                responses.append(
+                    _encode_response(
+                        {
+                            "id": "",
+                            "result": {"error": f"Error processing request: {str(e)}"},
+                        }
+                    )
                 )
-                + "\n"
-            )
-            sys.stdout.flush()
+
+        # Write the responses to stdout
+        _write_responses(responses)
+
+    loop.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+"""Helpers shared by the file reader and writer"""
+
+from array import array
+from typing import Optional, Tuple
+import codecs
+import errno
+import functools
+import mmap
+import os
+import re
+import stat
+
+
+# Codecs (by codecs.lookup name) where a 0x0A byte is always a newline and
+# never part of a multibyte sequence, so lines can be split on the raw bytes
+# and only the requested slice decoded. UTF-16/32 are not: 0x0A turns up
+# inside ordinary code units there. Other ASCII supersets not listed here
+# are recognised by probing the codec.
+ASCII_SAFE_ENCODINGS = frozenset(
+    {
+        "utf-8",
+        "utf-8-sig",
+        "ascii",
+        "iso8859-1",
+        "iso8859-15",
+        "cp1250",
+        "cp1251",
+        "cp1252",
+        "cp437",
+        "mac-roman",
+    }
+)
+
+# Codecs that mark the start of the file with a BOM. Slices are decoded with
+# the plain codec and the BOM dropped only from the slice at offset 0.
+BOM_CODECS = {"utf-8-sig": ("utf-8", "\ufeff")}
+
+# Byte order marks for encoding detection, longest first: the UTF-32 LE
+# mark starts with the UTF-16 LE one
+BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# stat errors that mean the path doesn't exist, as Path.exists() treats them
+_MISSING_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP})
+
+
+@functools.lru_cache(maxsize=64)
+def newline_is_byte(encoding: str) -> bool:
+    """
+    Whether a 0x0A byte in this encoding can only ever mean a newline
+
+    True for ASCII supersets such as UTF-8 and Latin-1, where lines can be
+    found on the raw bytes. False for e.g. UTF-16, where 0x0A also occurs
+    inside other characters.
+    """
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return False
+    if name in ASCII_SAFE_ENCODINGS:
+        return True
+    return "\n".encode(encoding) == b"\n" and "A".encode(encoding) == b"A"
+
+
+_LINE_END = re.compile(rb"\r\n?|\n")
+
+
+def scan_line_offsets(mm: mmap.mmap) -> "array[int]":
+    """
+    Byte offset of the start of every line in a mapped file, plus its size
+
+    Lines end at LF, CRLF or a lone CR, as in text mode. Files without a
+    CR are swept with mmap.find (memchr); the others with a regex.
+    """
+    offsets = array("Q", [0])
+    append = offsets.append
+    if mm.find(b"\r") == -1:
+        find = mm.find
+        pos = find(b"\n")
+        while pos != -1:
+            append(pos + 1)
+            pos = find(b"\n", pos + 1)
+    else:
+        for match in _LINE_END.finditer(mm):
+            append(match.end())
+
+    size = len(mm)
+    if offsets[-1] != size:
+        offsets.append(size)
+    return offsets
+
+
+def stat_and_validate(file_path: str) -> Tuple[Optional[os.stat_result], Optional[str]]:
+    """
+    Stat a path once and check that it is a regular file
+
+    Replaces the exists()/is_file()/getsize() sequence, which costs a stat
+    call each.
+
+    Returns:
+        Tuple of (stat result, None), or (None, error message) if the path
+        is missing or not a regular file. Other errors are raised.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError as e:
+        if e.errno not in _MISSING_ERRNOS:
+            raise
+        return None, f"File not found: {file_path}"
+    except ValueError:  # e.g. an embedded null byte
+        return None, f"File not found: {file_path}"
+
+    if not stat.S_ISREG(st.st_mode):
+        return None, f"Not a file: {file_path}"
+    return st, None
@@ -1,12 +1,24 @@
 from dataclasses import dataclass
 from typing import List, Optional, Tuple, Dict, Any
-from pathlib import Path
+from array import array
 from charset_normalizer import from_bytes
+import codecs
+import functools
+import mmap
 import os
 import io
+import stat
 
+from .._executor import bulk_map
+from ._common import BOM_CODECS, BOMS, newline_is_byte, scan_line_offsets, stat_and_validate
 
-@dataclass
+
+# Files at least this large are decoded from a memory map by read_file;
+# below it a plain read is cheaper than setting up the mapping
+READ_MMAP_THRESHOLD = 1024 * 1024
+
+
+@dataclass(slots=True)
 class LineRange:
     """Represents a range of lines in a file"""
 
@@ -14,7 +26,7 @@ class LineRange:
     end: int  # 1-based line number, inclusive
 
 
-@dataclass
+@dataclass(slots=True)
 class FileReadResult:
     """Result of a file read operation"""
 
@@ -24,6 +36,100 @@ class FileReadResult:
     metadata: Optional[Dict[str, Any]] = None
 
 
+def _cached_line_offsets(path: str, st: os.stat_result) -> "array[int]":
+    """
+    _line_offsets for a file, keyed on its stat result
+
+    The key includes the inode and ctime as well as mtime and size: a
+    same-size rewrite within one mtime tick, or one that restores the
+    mtime (rsync, git checkout, touch -r), still changes ctime, which
+    utime cannot set back.
+    """
+    return _line_offsets(
+        os.path.abspath(path), st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _line_offsets(
+    path: str, ino: int, mtime_ns: int, ctime_ns: int, size: int
+) -> "array[int]":
+    """
+    Byte offset of the start of every line, plus the file size at the end
+
+    Built by scan_line_offsets. Called through _cached_line_offsets,
+    which supplies the stat fields of the key.
+
+    Returns:
+        array('Q') with one more entry than the file has lines; a final
+        line without a trailing newline still counts as a line
+    """
+    if size == 0:
+        return array("Q", [0])
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return scan_line_offsets(mm)
+
+
+def _pread(fd: int, length: int, offset: int) -> bytes:
+    """
+    Read length bytes at offset without touching the fd's file position
+
+    Uses os.pread where available (POSIX), so it is safe to call from
+    several threads at once. Stops early only at end of file.
+    """
+    if not hasattr(os, "pread"):
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, length)
+
+    data = os.pread(fd, length, offset)
+    if len(data) == length or not data:
+        return data
+    # Large reads may come back short; collect the rest
+    parts = [data]
+    read = len(data)
+    while read < length:
+        data = os.pread(fd, length - read, offset + read)
+        if not data:
+            break
+        parts.append(data)
+        read += len(data)
+    return b"".join(parts)
+
+
+def _read_byte_range(
+    fd: int, offsets: "array[int]", start_line: int, end_line: int, encoding: str
+) -> Tuple[str, int]:
+    """
+    Read and decode lines start_line..end_line (1-based, inclusive) from fd
+
+    The byte span comes from the line-offset index, so this is a single
+    pread and only the requested slice is decoded. The result uses universal
+    newlines, as text-mode reads do.
+
+    Returns:
+        Tuple of (content, lines up to the end of the range)
+    """
+    total_lines = len(offsets) - 1
+    last_line = min(end_line, total_lines)
+    start_byte = offsets[min(start_line - 1, total_lines)]
+    end_byte = offsets[last_line]
+    if end_byte <= start_byte:
+        return "", last_line
+
+    data = _pread(fd, end_byte - start_byte, start_byte)
+    bom_codec = BOM_CODECS.get(codecs.lookup(encoding).name)
+    if bom_codec is None:
+        content = data.decode(encoding)
+    else:
+        content = data.decode(bom_codec[0])
+        if start_byte == 0 and content.startswith(bom_codec[1]):
+            content = content[len(bom_codec[1]):]
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content, last_line
+
+
 class FileReader:
     """Handles efficient partial file reading operations"""
 
@@ -38,10 +144,22 @@ class FileReader:
 
     def read_file(self, path: str, encoding: Optional[str] = None) -> str:
         file_encoding = encoding or self.default_encoding
-        content = None
-        with open(path, "r", encoding=file_encoding) as file:
-            content = file.read()
-
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < READ_MMAP_THRESHOLD:
+                content = file.read().decode(file_encoding)
+            else:
+                # Decode straight from the page cache rather than copying
+                # the whole file into a bytes object first
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    content = str(mm, file_encoding)
+
+        # Universal newlines, as text mode gives, but only paid for by
+        # files that contain a carriage return
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
         return content
 
     def read_line_range(
@@ -58,19 +176,9 @@ class FileReader:
             FileReadResult containing the requested content
         """
         try:
-            path_obj = Path(file_path)
-
-            if not path_obj.exists():
-                return FileReadResult(
-                    content="",
-                    line_range=line_range,
-                    error=f"File not found: {file_path}",
-                )
-
-            if not path_obj.is_file():
-                return FileReadResult(
-                    content="", line_range=line_range, error=f"Not a file: {file_path}"
-                )
+            st, error = stat_and_validate(file_path)
+            if error:
+                return FileReadResult(content="", line_range=line_range, error=error)
 
             # Validate line range
             if line_range.start < 1:
@@ -85,35 +193,24 @@ class FileReader:
                     error="End line must be >= start line",
                 )
 
-            # Read the specified lines
-            content = []
-            line_count = 0
-
             # Use provided encoding or default
             file_encoding = encoding or self.default_encoding
 
             try:
-                with open(file_path, "r", encoding=file_encoding) as f:
-                    # Skip lines before the range
-                    for _ in range(line_range.start - 1):
-                        line = f.readline()
-                        if not line:  # EOF
-                            break
-                        line_count += 1
-
-                    # Read lines in the range
-                    for _ in range(line_range.end - line_range.start + 1):
-                        line = f.readline()
-                        if not line:  # EOF
-                            break
-                        content.append(line)
-                        line_count += 1
+                if newline_is_byte(file_encoding):
+                    content, line_count = self._read_lines_indexed(
+                        file_path, line_range, file_encoding
+                    )
+                else:
+                    content, line_count = self._read_lines_text(
+                        file_path, line_range, file_encoding
+                    )
 
                 return FileReadResult(
-                    content="".join(content),
+                    content=content,
                     line_range=line_range,
                     metadata={
-                        "file_size": os.path.getsize(file_path),
+                        "file_size": st.st_size,
                         "total_lines": line_count,
                     },
                 )
@@ -129,6 +226,84 @@ class FileReader:
                 content="", line_range=line_range, error=f"Error reading file: {str(e)}"
             )
 
+    def read_many(
+        self, requests: List[Tuple[str, LineRange]], encoding: Optional[str] = None
+    ) -> List[FileReadResult]:
+        """
+        Read line ranges from many files at once
+
+        The reads run in parallel on a thread pool, so their syscall and
+        I/O latency overlaps instead of adding up.
+
+        Args:
+            requests: (file_path, line_range) pairs to read
+            encoding: Encoding for all files (default: the reader's default)
+
+        Returns:
+            One FileReadResult per request, in request order
+        """
+        return bulk_map(
+            lambda request: self.read_line_range(
+                request[0], request[1], encoding=encoding
+            ),
+            requests,
+        )
+
+    def _read_lines_indexed(
+        self, file_path: str, line_range: LineRange, encoding: str
+    ) -> Tuple[str, int]:
+        """
+        Read a line range using the cached line-offset index
+
+        The first read of a file builds its index; later reads just look up
+        the byte span and read it with a single pread. Only the requested
+        slice is decoded.
+
+        Returns:
+            Tuple of (content, lines up to the end of the range)
+        """
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            st = os.fstat(fd)
+            offsets = _cached_line_offsets(file_path, st)
+            return _read_byte_range(
+                fd, offsets, line_range.start, line_range.end, encoding
+            )
+        finally:
+            os.close(fd)
+
+    def _read_lines_text(
+        self, file_path: str, line_range: LineRange, encoding: str
+    ) -> Tuple[str, int]:
+        """
+        Read a line range line by line in text mode
+
+        Used for encodings where a 0x0A byte is not necessarily a newline.
+
+        Returns:
+            Tuple of (content, lines up to the end of the range)
+        """
+        content = []
+        line_count = 0
+
+        with open(file_path, "r", encoding=encoding) as f:
+            # Skip lines before the range
+            for _ in range(line_range.start - 1):
+                line = f.readline()
+                if not line:  # EOF
+                    break
+                line_count += 1
+
+            # Read lines in the range
+            for _ in range(line_range.end - line_range.start + 1):
+                line = f.readline()
+                if not line:  # EOF
+                    break
+                content.append(line)
+                line_count += 1
+
+        return "".join(content), line_count
+
     def read_context_around_line(
         self,
         file_path: str,
@@ -152,19 +327,86 @@ class FileReader:
         end_line = line_number + context_lines
 
         line_range = LineRange(start=start_line, end=end_line)
-        result = self.read_line_range(file_path, line_range, encoding=encoding)
+        context = {"target_line": line_number, "context_lines": context_lines}
+        file_encoding = encoding or self.default_encoding
 
-        # Add metadata about the context
-        if result.metadata is None:
-            result.metadata = {}
+        # Invalid ranges and encodings that need the text-mode path go
+        # through the general reader
+        if end_line < start_line or not newline_is_byte(file_encoding):
+            result = self.read_line_range(file_path, line_range, encoding=encoding)
+            result.metadata = {**(result.metadata or {}), **context}
+            return result
 
-        result.metadata.update(
-            {"target_line": line_number, "context_lines": context_lines}
-        )
+        # Otherwise validate off the open fd and read the span directly: one
+        # open, one fstat and one pread per call
+        try:
+            fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        except FileNotFoundError:
+            return FileReadResult(
+                content="",
+                line_range=line_range,
+                error=f"File not found: {file_path}",
+                metadata=context,
+            )
+        except Exception as e:
+            return FileReadResult(
+                content="",
+                line_range=line_range,
+                error=f"Error reading file: {str(e)}",
+                metadata=context,
+            )
 
-        return result
+        try:
+            st = os.fstat(fd)
+            if not stat.S_ISREG(st.st_mode):
+                return FileReadResult(
+                    content="",
+                    line_range=line_range,
+                    error=f"Not a file: {file_path}",
+                    metadata=context,
+                )
+
+            offsets = _cached_line_offsets(file_path, st)
+            content, line_count = _read_byte_range(
+                fd, offsets, start_line, end_line, file_encoding
+            )
+            return FileReadResult(
+                content=content,
+                line_range=line_range,
+                metadata={
+                    "file_size": st.st_size,
+                    "total_lines": line_count,
+                    **context,
+                },
+            )
+        except UnicodeDecodeError as e:
+            return FileReadResult(
+                content="",
+                line_range=line_range,
+                error=f"Encoding error: {file_encoding} is not compatible with this file. {str(e)}",
+                metadata=context,
+            )
+        except Exception as e:
+            return FileReadResult(
+                content="",
+                line_range=line_range,
+                error=f"Error reading file: {str(e)}",
+                metadata=context,
+            )
+        finally:
+            os.close(fd)
 
     def detect_encoding(self, file_path: str, sample_size: int = 1024) -> str | None:
+        """
+        Guess a file's encoding from its first sample_size bytes
+
+        A byte order mark wins, then strict UTF-8, then Latin-1 if typical
+        Latin-1 letters show up, and only then charset_normalizer's
+        statistical guess.
+
+        Returns:
+            Encoding name, or None for an empty or unreadable file
+        """
         try:
             with open(file_path, "rb") as file:
                 raw_data = file.read(sample_size)
@@ -172,9 +414,17 @@ class FileReader:
             if not raw_data:
                 return None
 
-            # Try UTF-8 first (strict)
+            for bom, encoding in BOMS:
+                if raw_data.startswith(bom):
+                    return encoding
+
+            # Try UTF-8 first (strict). Decode incrementally when the sample
+            # stops short of the end of the file, so a character cut off by
+            # the sample boundary doesn't rule UTF-8 out.
             try:
-                raw_data.decode("utf-8")
+                codecs.getincrementaldecoder("utf-8")().decode(
+                    raw_data, final=len(raw_data) < sample_size
+                )
                 return "utf-8"
             except UnicodeDecodeError:
                 pass
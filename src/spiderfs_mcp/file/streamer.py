@@ -1,31 +1,212 @@
-from typing import Iterator, Optional, Dict, Any, Tuple
+from typing import BinaryIO, Iterator, Optional, Dict, Any, Tuple, TypeVar, Union
 from pathlib import Path
+from collections import namedtuple
+import codecs
+import errno
+import io
+import mmap
 import os
+import queue
+import shutil
+import threading
+
+# Files at least this large are memory-mapped when streamed as raw bytes
+MMAP_THRESHOLD = 1024 * 1024
+
+# Files at least this large get a sequential-access hint before streaming;
+# smaller ones are read in a handful of calls anyway
+READAHEAD_THRESHOLD = 1024 * 1024
+
+# Default chunk sizes. Every chunk costs a yield plus per-chunk framing in the
+# consumer, so small chunks are dominated by overhead rather than I/O.
+DEFAULT_LINE_CHUNK_SIZE = 4000
+DEFAULT_BYTE_CHUNK_SIZE = 256 * 1024
+
+# Raw read size when streaming by lines
+LINE_READ_BLOCK_SIZE = 64 * 1024
+
+# Read buffer for small byte chunks from files that can't be memory-mapped,
+# so each read syscall fetches many chunks
+BYTE_READ_BUFFER_SIZE = 1024 * 1024
+
+# Read buffers reused across zero-copy streams that can't be memory-mapped.
+# Only buffers of DEFAULT_BYTE_CHUNK_SIZE are pooled, a few at most, so the
+# memory held stays bounded whatever chunk sizes callers ask for.
+_BUFFER_POOL: list = []
+_BUFFER_POOL_LOCK = threading.Lock()
+_BUFFER_POOL_MAX = 4
+
+
+def _acquire_buffer(size: int) -> bytearray:
+    """Take a read buffer of the given size from the pool, or allocate one"""
+    if size == DEFAULT_BYTE_CHUNK_SIZE:
+        with _BUFFER_POOL_LOCK:
+            if _BUFFER_POOL:
+                return _BUFFER_POOL.pop()
+    return bytearray(size)
+
+
+def _release_buffer(buf: bytearray) -> None:
+    """Return a read buffer to the pool, if it is of the pooled size"""
+    if len(buf) != DEFAULT_BYTE_CHUNK_SIZE:
+        return
+    with _BUFFER_POOL_LOCK:
+        if len(_BUFFER_POOL) < _BUFFER_POOL_MAX:
+            _BUFFER_POOL.append(buf)
+
+
+class _ChunkMeta(tuple):
+    """
+    Dict-style read access for chunk metadata tuples
+
+    Chunk metadata is a namedtuple, so each yielded chunk costs one small
+    tuple rather than a fresh dict. Reading it like the dicts it replaces
+    (metadata["file_size"], "key" in metadata, .get, dict(metadata)) keeps
+    working; _asdict() gives a real dict, e.g. for JSON.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                key = self._fields.index(key)
+            except ValueError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._fields
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self._fields else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+
+class LineChunkMeta(
+    _ChunkMeta,
+    namedtuple("LineChunkMeta", "chunk_number lines_in_chunk file_size lines_read_so_far"),
+):
+    """Metadata for a chunk from stream_file_by_lines"""
+
+    __slots__ = ()
+
+
+class ByteChunkMeta(
+    _ChunkMeta,
+    namedtuple(
+        "ByteChunkMeta",
+        "chunk_number estimated_total_chunks bytes_in_chunk file_size bytes_read_so_far is_last_chunk",
+    ),
+):
+    """Metadata for a chunk from stream_file_by_bytes"""
+
+    __slots__ = ()
+
+
+T = TypeVar("T")
+
+
+def _advise_sequential(fd: int) -> None:
+    """
+    Tell the kernel a file will be read front to back
+
+    POSIX_FADV_SEQUENTIAL widens readahead on the descriptor, so disk reads
+    overlap with processing on a cold cache. A no-op where posix_fadvise
+    isn't available (macOS, Windows) or the file doesn't support it.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except OSError:
+        pass
+
+
+def _prefetched(chunks: Iterator[T], depth: int) -> Iterator[T]:
+    """
+    Produce chunks on a background thread, keeping up to depth of them ready
+
+    File reads and decoding then overlap with whatever the consumer does
+    with the previous chunk (double buffering for depth=2). If the consumer
+    stops early, the producer notices within a short timeout, closes the
+    underlying iterator and exits.
+    """
+    ready: "queue.Queue" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for chunk in chunks:
+                if not put((True, chunk)):
+                    return
+            put((False, None))
+        except BaseException as e:
+            put((False, e))
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+    producer = threading.Thread(target=produce, name="spiderfs-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            more, item = ready.get()
+            if not more:
+                if item is not None:
+                    raise item
+                return
+            yield item
+    finally:
+        stop.set()
 
 
 class FileStreamer:
     """Handles streaming file contents in manageable chunks"""
     
-    def __init__(self, chunk_size: int = 1000, default_encoding: str = 'utf-8'):
+    def __init__(self, chunk_size: int = DEFAULT_LINE_CHUNK_SIZE, default_encoding: str = 'utf-8'):
         """
         Initialize the file streamer
         
         Args:
-            chunk_size: Number of lines per chunk
+            chunk_size: Number of lines per chunk. Larger chunks mean fewer
+                round trips but more memory held per chunk.
         """
         self.chunk_size = chunk_size
         self.default_encoding = default_encoding
         
-    def stream_file_by_lines(self, file_path: str, encoding: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    def stream_file_by_lines(self, file_path: str, encoding: Optional[str] = None, prefetch: int = 0) -> Iterator[Tuple[str, Union[LineChunkMeta, Dict[str, Any]]]]:
         """
         Stream a file's contents in chunks of lines
         
         Args:
             file_path: Path to the file to stream
+            prefetch: Number of chunks to read ahead on a background thread
+                while the caller handles the current one (0 = read inline)
             
         Yields:
-            Tuple of (content_chunk, metadata)
+            Tuple of (content_chunk, metadata). Metadata is a LineChunkMeta,
+            or a dict with an "error" key if the file can't be streamed.
         """
+        chunks = self._stream_lines(file_path, encoding)
+        if prefetch > 0:
+            chunks = _prefetched(chunks, prefetch)
+        yield from chunks
+    
+    def _stream_lines(self, file_path: str, encoding: Optional[str]) -> Iterator[Tuple[str, Union[LineChunkMeta, Dict[str, Any]]]]:
+        """Produce the chunks for stream_file_by_lines"""
         try:
             path_obj = Path(file_path)
             
@@ -45,34 +226,61 @@ class FileStreamer:
             file_encoding = encoding or self.default_encoding
             
             try:
-                with open(file_path, 'r', encoding=file_encoding) as f:
+                # Decode raw blocks incrementally and cut each chunk at its
+                # chunk_size-th newline, instead of assembling it from
+                # individual readline() calls. The newline decoder gives the
+                # same universal-newline translation as text mode, including
+                # a \r\n pair split across two blocks.
+                decoder = io.IncrementalNewlineDecoder(
+                    codecs.getincrementaldecoder(file_encoding)(errors='strict'),
+                    translate=True,
+                )
+                pending = ""
+                scan = 0
+                lines_in_chunk = 0
+                
+                with open(file_path, 'rb') as f:
+                    if file_size >= READAHEAD_THRESHOLD:
+                        _advise_sequential(f.fileno())
                     while True:
-                        # Read a chunk of lines
-                        lines = []
-                        for _ in range(self.chunk_size):
-                            line = f.readline()
-                            if not line:  # EOF
-                                break
-                            lines.append(line)
-                            total_lines += 1
+                        data = f.read(LINE_READ_BLOCK_SIZE)
+                        pending += decoder.decode(data, final=not data)
                         
-                        # If we read something, yield it
-                        if lines:
-                            chunk_number += 1
-                            content_chunk = "".join(lines)
-                            
-                            # Create metadata for this chunk
-                            metadata = {
-                                "chunk_number": chunk_number,
-                                "lines_in_chunk": len(lines),
-                                "file_size": file_size,
-                                "lines_read_so_far": total_lines,
-                            }
+                        start = 0
+                        while True:
+                            newline = pending.find("\n", scan)
+                            if newline == -1:
+                                scan = len(pending)
+                                break
+                            scan = newline + 1
+                            lines_in_chunk += 1
                             
-                            yield content_chunk, metadata
-                        else:
-                            # No more lines to read
+                            if lines_in_chunk == self.chunk_size:
+                                chunk_number += 1
+                                total_lines += lines_in_chunk
+                                yield pending[start:scan], LineChunkMeta(
+                                    chunk_number, lines_in_chunk, file_size, total_lines
+                                )
+                                start = scan
+                                lines_in_chunk = 0
+                        
+                        if start:
+                            pending = pending[start:]
+                            scan -= start
+                        
+                        if not data:
                             break
+                
+                # Whatever is left is the last chunk; a final line without a
+                # trailing newline still counts as a line
+                if pending:
+                    if not pending.endswith("\n"):
+                        lines_in_chunk += 1
+                    chunk_number += 1
+                    total_lines += lines_in_chunk
+                    yield pending, LineChunkMeta(
+                        chunk_number, lines_in_chunk, file_size, total_lines
+                    )
             
             except UnicodeDecodeError as e:
                 yield "", {
@@ -88,18 +296,37 @@ class FileStreamer:
                 "total_chunks": 0
             }
             
-    def stream_file_by_bytes(self, file_path: str, byte_chunk_size: int = 8192, binary_mode: bool = True) -> Iterator[Tuple[bytes, Dict[str, Any]]]:
+    def stream_file_by_bytes(self, file_path: str, byte_chunk_size: int = DEFAULT_BYTE_CHUNK_SIZE, binary_mode: bool = True, zero_copy: bool = False, prefetch: int = 0) -> Iterator[Tuple[Union[bytes, memoryview], Union[ByteChunkMeta, Dict[str, Any]]]]:
         """
         Stream a file's contents in chunks of bytes
         
         Args:
             file_path: Path to the file to stream
-            byte_chunk_size: Size of each chunk in bytes
+            byte_chunk_size: Size of each chunk in bytes. The 256 KiB default
+                keeps per-chunk overhead negligible for bandwidth-bound
+                transfers; pass a smaller size when latency to the first
+                chunk matters more than throughput.
             binary_mode: Whether to open the file in binary mode
+            zero_copy: Yield memoryview slices of the mapped file (or of a
+                reused read buffer when mapping isn't possible) instead of
+                bytes copies. A chunk is only valid until the next one is
+                requested; consumers that keep chunks must copy them.
+            prefetch: Number of chunks to read ahead on a background thread
+                while the caller handles the current one (0 = read inline).
+                Ignored with zero_copy, whose chunks are only valid until
+                the next read.
             
         Yields:
-            Tuple of (bytes_chunk, metadata)
+            Tuple of (bytes_chunk, metadata). Metadata is a ByteChunkMeta,
+            or a dict with an "error" key if the file can't be streamed.
         """
+        chunks = self._stream_bytes(file_path, byte_chunk_size, zero_copy)
+        if prefetch > 0 and not zero_copy:
+            chunks = _prefetched(chunks, prefetch)
+        yield from chunks
+    
+    def _stream_bytes(self, file_path: str, byte_chunk_size: int, zero_copy: bool) -> Iterator[Tuple[Union[bytes, memoryview], Union[ByteChunkMeta, Dict[str, Any]]]]:
+        """Produce the chunks for stream_file_by_bytes"""
         try:
             path_obj = Path(file_path)
             
@@ -116,26 +343,14 @@ class FileStreamer:
             bytes_read = 0
             chunk_number = 0
             
-            with open(file_path, 'rb') as f:
-                while True:
-                    chunk = f.read(byte_chunk_size)
-                    if not chunk:  # EOF
-                        break
-                    
-                    chunk_number += 1
-                    bytes_read += len(chunk)
-                    
-                    # Create metadata for this chunk
-                    metadata = {
-                        "chunk_number": chunk_number,
-                        "estimated_total_chunks": estimated_chunks,
-                        "bytes_in_chunk": len(chunk),
-                        "file_size": file_size,
-                        "bytes_read_so_far": bytes_read,
-                        "is_last_chunk": bytes_read >= file_size
-                    }
-                    
-                    yield chunk, metadata
+            for chunk in self._iter_byte_chunks(file_path, file_size, byte_chunk_size, zero_copy):
+                chunk_number += 1
+                chunk_length = len(chunk)
+                bytes_read += chunk_length
+                
+                yield chunk, ByteChunkMeta(
+                    chunk_number, estimated_chunks, chunk_length, file_size, bytes_read, bytes_read >= file_size
+                )
                         
         except Exception as e:
             yield b"", {
@@ -143,3 +358,168 @@ class FileStreamer:
                 "chunk_number": 0,
                 "total_chunks": 0
             }
+
+    def send_file(self, file_path: str, out_file: BinaryIO) -> Dict[str, Any]:
+        """
+        Copy a file's raw bytes to an open binary file or socket
+        
+        For plain pass-through, where the consumer does not need per-chunk
+        metadata, this skips chunk iteration entirely: os.sendfile copies
+        inside the kernel when the platform supports it for the destination,
+        otherwise data is copied with shutil.copyfileobj. Sockets must be in
+        blocking mode.
+        
+        Args:
+            file_path: Path to the file to send
+            out_file: Writable binary file object or socket
+            
+        Returns:
+            Dictionary with bytes_sent and file_size, or error
+        """
+        try:
+            path_obj = Path(file_path)
+            
+            if not path_obj.exists() or not path_obj.is_file():
+                return {"error": f"File not found or not a regular file: {file_path}"}
+            
+            with open(file_path, 'rb') as f:
+                file_size = os.fstat(f.fileno()).st_size
+                if file_size >= READAHEAD_THRESHOLD:
+                    _advise_sequential(f.fileno())
+                bytes_sent = self._copy_raw(f, out_file, file_size)
+            
+            return {
+                "bytes_sent": bytes_sent,
+                "file_size": file_size,
+            }
+        
+        except Exception as e:
+            return {"error": f"Error sending file: {str(e)}"}
+    
+    def _copy_raw(self, in_file: BinaryIO, out_file: BinaryIO, file_size: int) -> int:
+        """Copy in_file to out_file, using os.sendfile where possible"""
+        out_fd = None
+        if hasattr(os, "sendfile"):
+            try:
+                out_fd = out_file.fileno()
+            except (AttributeError, OSError, io.UnsupportedOperation):
+                out_fd = None
+        
+        if out_fd is not None:
+            # Anything already buffered in the file object must go out first
+            if hasattr(out_file, "flush"):
+                out_file.flush()
+            offset = 0
+            try:
+                while offset < file_size:
+                    sent = os.sendfile(out_fd, in_file.fileno(), offset, file_size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return offset
+            except OSError as e:
+                # Unsupported destination (e.g. not a socket on macOS): copy instead
+                if offset or e.errno not in (errno.EINVAL, errno.ENOTSOCK, errno.ENOSYS, errno.EOPNOTSUPP):
+                    raise
+        
+        in_file.seek(0)
+        shutil.copyfileobj(in_file, out_file, DEFAULT_BYTE_CHUNK_SIZE)
+        return in_file.tell()
+
+    def _iter_byte_chunks(self, file_path: str, file_size: int, byte_chunk_size: int, zero_copy: bool = False) -> Iterator[Union[bytes, memoryview]]:
+        """
+        Yield raw chunks of a file
+        
+        Small files are read with a single read call. Larger files are
+        memory-mapped so chunks are sliced straight out of the page cache
+        instead of going through a read syscall and buffer copy per chunk.
+        
+        Chunks of at least io.DEFAULT_BUFFER_SIZE are read through the raw
+        FileIO rather than a BufferedReader: each read goes straight to
+        read(2) into the destination, as an intermediate buffer smaller
+        than the chunk would only add a copy. Smaller chunks from a large
+        file that can't be mapped are served from a BYTE_READ_BUFFER_SIZE
+        buffer, one syscall per buffer fill rather than per 8 KiB.
+        
+        Args:
+            file_path: Path to the file to read
+            file_size: Size of the file in bytes
+            byte_chunk_size: Size of each chunk in bytes
+            zero_copy: Yield memoryview slices instead of bytes copies
+            
+        Yields:
+            Chunks of at most byte_chunk_size bytes
+        """
+        buffering = 0 if byte_chunk_size >= io.DEFAULT_BUFFER_SIZE else -1
+        
+        if file_size < MMAP_THRESHOLD:
+            with open(file_path, 'rb', buffering=buffering) as f:
+                data = f.read()
+            view = memoryview(data) if zero_copy else data
+            for offset in range(0, len(data), byte_chunk_size):
+                yield view[offset:offset + byte_chunk_size]
+            return
+        
+        with open(file_path, 'rb', buffering=0) as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # Not mappable (e.g. some network/FUSE filesystems, or the
+                # file was truncated in the meantime): read it instead
+                _advise_sequential(f.fileno())
+                reader = f if buffering == 0 else io.BufferedReader(f, BYTE_READ_BUFFER_SIZE)
+                yield from self._iter_read_chunks(reader, byte_chunk_size, zero_copy)
+                return
+            view = memoryview(mm) if zero_copy else mm
+            try:
+                # Hint the kernel to read ahead aggressively (Linux/macOS only)
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                if hasattr(mmap, "MADV_WILLNEED"):
+                    mm.madvise(mmap.MADV_WILLNEED)
+                for offset in range(0, len(mm), byte_chunk_size):
+                    yield view[offset:offset + byte_chunk_size]
+            finally:
+                if zero_copy:
+                    view.release()
+                try:
+                    mm.close()
+                except BufferError:
+                    # A consumer still holds a chunk; the mapping is freed
+                    # once that last view is garbage collected
+                    pass
+
+    def _iter_read_chunks(self, f: BinaryIO, byte_chunk_size: int, zero_copy: bool) -> Iterator[Union[bytes, memoryview]]:
+        """
+        Yield chunks from an open file with read calls
+        
+        In zero-copy mode every chunk is read into the same pooled buffer
+        with readinto, so no per-chunk object is allocated; each yielded
+        view is overwritten by the next chunk.
+        
+        Args:
+            f: File opened in binary mode, buffered or raw
+            byte_chunk_size: Size of each chunk in bytes
+            zero_copy: Yield views of a reused buffer instead of bytes
+            
+        Yields:
+            Chunks of at most byte_chunk_size bytes
+        """
+        if not zero_copy:
+            while True:
+                chunk = f.read(byte_chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        
+        buf = _acquire_buffer(byte_chunk_size)
+        view = memoryview(buf)
+        try:
+            while True:
+                n = f.readinto(view)
+                if not n:
+                    return
+                yield view[:n]
+        finally:
+            view.release()
+            _release_buffer(buf)
@@ -1,24 +1,113 @@
 import shutil
 import os
+import sys
 import tempfile
-import filecmp
+import mmap
+import codecs
 
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any, Optional, Tuple, List
+from typing import IO, AnyStr, Dict, Any, Iterator, NamedTuple, Optional, Tuple, List
 from pathlib import Path
 
+from .._executor import bulk_map
+from ._common import BOM_CODECS, newline_is_byte, scan_line_offsets, stat_and_validate
 
-@dataclass
-class LineEdit:
-    """Represents an edit to be made to specific lines"""
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl request that clones a file's extents on btrfs, XFS and other CoW filesystems
+FICLONE = 0x40049409
+
+
+def _clonefile_func():
+    """Look up macOS clonefile(2), or None elsewhere"""
+    if sys.platform != "darwin":
+        return None
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        clonefile = libc.clonefile
+        clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+        clonefile.restype = ctypes.c_int
+        return clonefile
+    except (ImportError, OSError, AttributeError):
+        return None
+
+
+_clonefile = _clonefile_func()
+
+
+def _reflink_copy(src: str, dst: str) -> bool:
+    """
+    Create dst as a copy-on-write clone of src, if the filesystem supports it
+    
+    Cloning only adds metadata, so it is O(1) regardless of file size. dst
+    must not exist. Returns False (leaving no dst behind) when cloning is
+    not possible, so the caller can fall back to a regular copy.
+    """
+    if _clonefile is not None:
+        return _clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+    
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, os.fstat(src_fd).st_mode & 0o7777)
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            cloned = True
+        except OSError:
+            # EOPNOTSUPP, EXDEV, EINVAL, ...: not a CoW filesystem
+            cloned = False
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    
+    if not cloned:
+        os.unlink(dst)
+    return cloned
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """
+    Write all of data to fd with os.write, reserving the space first
+    
+    posix_fallocate allocates the blocks up front instead of extending the
+    file on every write. Where it isn't available or supported the data is
+    just written.
+    """
+    if data and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, len(data))
+        except OSError:
+            pass  # EOPNOTSUPP, EINVAL, ...: let the writes extend the file
+    
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+class LineEdit(NamedTuple):
+    """
+    Represents an edit to be made to specific lines
+
+    A NamedTuple rather than a dataclass: edits are built in bulk from
+    request data and only read, so a plain tuple is cheaper to create.
+    """
 
     line_start: int  # 1-based line number
     line_end: int  # 1-based line number, inclusive
     new_content: str  # Content to replace the specified lines with
 
 
-@dataclass
+@dataclass(slots=True)
 class FileWriteResult:
     """Result of a file write operation"""
 
@@ -66,35 +155,116 @@ class FileWriter:
             if not path_obj.exists() or not path_obj.is_file():
                 return False, None, f"File not found or not a regular file: {file_path}"
             
-            # Create backup file in the same directory
+            # Create backup file in the same directory. Never write through
+            # an old backup: it may be a hard link made by _link_backup.
             backup_path = f"{file_path}.bak"
-            shutil.copy2(file_path, backup_path)
+            if os.path.lexists(backup_path):
+                os.unlink(backup_path)
+            
+            # Clone on copy-on-write filesystems, otherwise copy. copyfile
+            # stays in the kernel (sendfile/copy_file_range/fcopyfile); only
+            # the mode is carried over so a private file doesn't get a
+            # readable backup.
+            if not _reflink_copy(file_path, backup_path):
+                shutil.copyfile(file_path, backup_path)
+                shutil.copymode(file_path, backup_path)
             return True, backup_path, None
             
         except Exception as e:
             return False, None, f"Error creating backup: {str(e)}"
     
-    def apply_line_edits(self, file_path: str, edits: List[LineEdit], encoding: Optional[str] = None) -> FileWriteResult:
+    def _link_backup(self, file_path: str) -> Tuple[bool, Optional[str], Optional[str]]:
         """
-        Apply a list of line edits to a file
+        Create a backup by hard-linking the original file
+        
+        Only valid when the file is about to be replaced by a rename rather
+        than modified in place: the backup keeps the old inode alive, so no
+        data is copied. Falls back to a regular copy when linking fails.
         
         Args:
-            file_path: Path to the file to edit
-            edits: List of edits to apply
+            file_path: Path to the file to backup
+            
+        Returns:
+            Tuple of (success, backup_path, error_message)
+        """
+        backup_path = f"{file_path}.bak"
+        try:
+            if os.path.lexists(backup_path):
+                os.unlink(backup_path)
+            os.link(file_path, backup_path)
+            return True, backup_path, None
+        except OSError:
+            return self._create_backup(file_path)
+    
+    @contextmanager
+    def _replacement_fd(self, file_path: str) -> Iterator[int]:
+        """
+        Open a temporary file descriptor that atomically replaces file_path on success
+        
+        The temporary file lives next to the target, so the rename stays on
+        one filesystem. When the block exits normally it is closed, given
+        the original's mode and moved over it with os.replace; on error it
+        is removed.
+        """
+        path_obj = Path(file_path)
+        fd, temp_path = tempfile.mkstemp(dir=str(path_obj.parent), prefix=f".{path_obj.name}.", suffix=".tmp")
+        try:
+            try:
+                yield fd
+            finally:
+                os.close(fd)
+            shutil.copymode(file_path, temp_path)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    
+    @contextmanager
+    def _replacement_file(self, file_path: str, mode: str = 'w', encoding: Optional[str] = None) -> Iterator[IO]:
+        """Like _replacement_fd, but yields a file object for incremental writes"""
+        with self._replacement_fd(file_path) as fd:
+            with os.fdopen(fd, mode, encoding=encoding, closefd=False) as temp_file:
+                yield temp_file
+    
+    def _replace_contents(self, file_path: str, content: str, encoding: str) -> None:
+        """
+        Atomically replace the contents of an existing file
+        
+        The content is encoded once and written with os.write into a
+        preallocated temporary file, bypassing the text I/O stack.
+        """
+        if os.linesep != '\n':
+            content = content.replace('\n', os.linesep)  # As text mode would
+        data = content.encode(encoding)
+        with self._replacement_fd(file_path) as fd:
+            _write_all(fd, data)
+    
+    def write_file(self, file_path: str, content: str, encoding: Optional[str] = None) -> FileWriteResult:
+        """
+        Replace the entire contents of a file, creating it if it doesn't exist
+        
+        The old contents are never read. Existing files are replaced
+        atomically via a temporary file in the same directory.
+        
+        Args:
+            file_path: Path to the file to write
+            content: New content of the file
             
         Returns:
             FileWriteResult indicating success or failure
         """
         try:
             path_obj = Path(file_path)
+            file_encoding = encoding or self.default_encoding
             
-            # Validate file
             if not path_obj.exists():
+                with open(file_path, 'w', encoding=file_encoding) as f:
+                    f.write(content)
                 return FileWriteResult(
-                    success=False,
-                    error=f"File not found: {file_path}"
+                    success=True,
+                    changed_lines=len(content.splitlines())
                 )
-                
+            
             if not path_obj.is_file():
                 return FileWriteResult(
                     success=False,
@@ -104,18 +274,46 @@ class FileWriter:
             # Create backup if requested
             backup_path = None
             if self.create_backup:
-                success, backup_path, error = self._create_backup(file_path)
+                success, backup_path, error = self._link_backup(file_path)
                 if not success:
                     return FileWriteResult(
                         success=False,
                         error=error
                     )
             
-            # Sort edits by line number (descending) to avoid line number changes
-            sorted_edits = sorted(edits, key=lambda e: e.line_start, reverse=True)
+            self._replace_contents(file_path, content, file_encoding)
             
-            # Validate edits
-            for edit in sorted_edits:
+            return FileWriteResult(
+                success=True,
+                changed_lines=len(content.splitlines()),
+                backup_path=backup_path
+            )
+        except UnicodeEncodeError as e:
+            return FileWriteResult(
+                success=False,
+                error=f"Encoding error: {file_encoding} cannot encode this content. {str(e)}"
+            )
+        except Exception as e:
+            return FileWriteResult(
+                success=False,
+                error=f"Error writing file: {str(e)}"
+            )
+    
+    def apply_line_edits(self, file_path: str, edits: List[LineEdit], encoding: Optional[str] = None) -> FileWriteResult:
+        """
+        Apply a list of line edits to a file
+        
+        Args:
+            file_path: Path to the file to edit
+            edits: List of edits to apply
+            
+        Returns:
+            FileWriteResult indicating success or failure
+        """
+        try:
+            # Validate edits first, so bad input costs no file I/O and
+            # leaves no backup behind
+            for edit in edits:
                 if edit.line_start < 1:
                     return FileWriteResult(
                         success=False,
@@ -126,10 +324,30 @@ class FileWriter:
                         success=False,
                         error=f"Invalid line range: {edit.line_start}-{edit.line_end}. End must be >= start"
                     )
+
+            # Validate file
+            st, error = stat_and_validate(file_path)
+            if error:
+                return FileWriteResult(
+                    success=False,
+                    error=error
+                )
+            
+            # Backups are only made once a change is certain
+            backup = self.create_backup
+            
+            # Sort edits by line number (descending) to avoid line number changes
+            sorted_edits = sorted(edits, key=lambda e: e.line_start, reverse=True)
             
             # Use provided encoding or default
             file_encoding = encoding or self.default_encoding
             
+            # Apply edits on the raw bytes when possible, without decoding
+            # or loading the whole file
+            result = self._apply_line_edits_bytes(file_path, sorted_edits, file_encoding, backup)
+            if result is not None:
+                return result
+            
             try:
                 # Read the entire file
                 with open(file_path, 'r', encoding=file_encoding) as f:
@@ -171,17 +389,8 @@ class FileWriter:
                         # Count actual lines replaced for accurate reporting
                         changed_lines += num_lines_to_replace
                 
-                # Create temp file for atomic write
-                with tempfile.NamedTemporaryFile(mode='w', encoding=file_encoding, delete=False) as temp_file:
-                    temp_path = temp_file.name
-                    temp_file.writelines(lines)
-                
                 # If no changes were made, don't bother writing
-                if changed_lines == 0 and filecmp.cmp(temp_path, file_path):
-                    os.unlink(temp_path)  # Remove temp file
-                    if backup_path:
-                        os.unlink(backup_path)  # Remove unnecessary backup
-                    
+                if changed_lines == 0:
                     return FileWriteResult(
                         success=True,
                         changed_lines=0,
@@ -189,8 +398,20 @@ class FileWriter:
                         metadata={"unchanged": True}
                     )
                 
-                # Atomic move temp file to original
-                shutil.move(temp_path, file_path)
+                # The file is replaced by a rename, so a hard link
+                # preserves the original
+                backup_path = None
+                if backup:
+                    success, backup_path, error = self._link_backup(file_path)
+                    if not success:
+                        return FileWriteResult(
+                            success=False,
+                            error=error
+                        )
+                
+                # Atomically replace the file via a temp file in the same
+                # directory, so the swap is a single rename
+                self._replace_contents(file_path, "".join(lines), file_encoding)
                 
                 return FileWriteResult(
                     success=True,
@@ -208,6 +429,222 @@ class FileWriter:
                 error=f"Error applying edits: {str(e)}"
             )
     
+    def apply_many(self, edits_by_path: Dict[str, List[LineEdit]], encoding: Optional[str] = None) -> Dict[str, FileWriteResult]:
+        """
+        Apply line edits to many files at once
+        
+        Each file is edited independently with apply_line_edits, in
+        parallel on a thread pool.
+        
+        Args:
+            edits_by_path: Edits to apply, keyed by file path
+            encoding: Encoding for all files (default: the writer's default)
+            
+        Returns:
+            FileWriteResult for each path, in the order given
+        """
+        paths = list(edits_by_path)
+        results = bulk_map(
+            lambda path: self.apply_line_edits(path, edits_by_path[path], encoding=encoding),
+            paths
+        )
+        return dict(zip(paths, results))
+    
+    @staticmethod
+    def _byte_operands(data: bytes, old_string: str, new_string: str, encoding: str) -> Optional[Tuple[bytes, bytes]]:
+        """
+        Encode a replacement's operands if it can be done on the raw bytes
+        
+        That is the case for UTF-8, where an encoded needle only matches at
+        character boundaries, as long as reading in text mode wouldn't
+        translate any newlines and writing wouldn't translate them back.
+        The data is still checked to be valid UTF-8, as decoding would.
+        
+        Returns:
+            Tuple of (old bytes, new bytes), or None to replace in text
+        """
+        if os.linesep != '\n' or codecs.lookup(encoding).name != 'utf-8' or b'\r' in data:
+            return None
+        try:
+            operands = old_string.encode(encoding), new_string.encode(encoding)
+        except UnicodeEncodeError:
+            return None
+        if not data.isascii():
+            data.decode(encoding)  # Raises UnicodeDecodeError like a text read
+        return operands
+    
+    @staticmethod
+    def _count_replaced_lines(content: AnyStr, old_string: AnyStr, new_string: AnyStr, replacements: int) -> int:
+        """
+        Count the lines touched by replacing the first occurrences of a string
+        
+        Only the hits are visited: str.find locates each one and str.count
+        tracks the line number between them, both in C. A hit touches as
+        many lines as the longer of old_string and new_string spans; a line
+        touched by several hits is counted once.
+        
+        Args:
+            content: Original content, as str or as UTF-8 bytes
+            old_string: String being replaced, of the same type
+            new_string: Replacement string, of the same type
+            replacements: Number of occurrences replaced
+            
+        Returns:
+            Number of changed lines
+        """
+        newline = b'\n' if isinstance(content, bytes) else '\n'
+        
+        def line_span(text: AnyStr) -> int:
+            # A trailing newline ends the last touched line rather than starting one
+            return max(1, text.count(newline) + (0 if text.endswith(newline) else 1))
+        
+        span = max(line_span(old_string), line_span(new_string))
+        old_newlines = old_string.count(newline)
+        
+        changed_lines = 0
+        counted_through = -1  # Last (0-based) line already counted
+        line = 0
+        pos = 0
+        for _ in range(replacements):
+            hit = content.find(old_string, pos)
+            line += content.count(newline, pos, hit)
+            first = max(line, counted_through + 1)
+            last = line + span - 1
+            if last >= first:
+                changed_lines += last - first + 1
+                counted_through = last
+            line += old_newlines
+            pos = hit + len(old_string)
+        
+        return changed_lines
+    
+    @staticmethod
+    def _edit_text(new_content: str) -> str:
+        """Normalize an edit's new content the way apply_line_edits splices it"""
+        new_lines = new_content.splitlines(True)  # Keep line endings
+        for i, line in enumerate(new_lines):
+            if not line.endswith('\n') and i < len(new_lines) - 1:
+                new_lines[i] = line + '\n'
+        return "".join(new_lines)
+    
+    def _apply_line_edits_bytes(self, file_path: str, sorted_edits: List[LineEdit], encoding: str, backup: bool) -> Optional[FileWriteResult]:
+        """
+        Apply edits directly on the file's bytes, if possible
+        
+        Each edit's byte span comes from line offsets scanned on the mapping
+        of the file as opened here. If every changed span keeps its lines'
+        byte lengths, the new bytes are written in place with os.pwrite: no
+        full read, temp file or rename. Otherwise the file
+        is streamed into a replacement: unchanged stretches are copied
+        straight from a read-only mmap and only the new content is encoded,
+        so memory use does not grow with file size.
+        
+        A requested backup is made once a change is certain: a copy for
+        in-place writes, a hard link to the old inode for replacements.
+        
+        Only used for non-overlapping, in-range edits in encodings where
+        0x0A is always a newline and no BOM is written, on files without
+        carriage returns (the regular path normalizes line endings, which
+        this one would not).
+        
+        Args:
+            file_path: Path to the file to edit
+            sorted_edits: Validated edits, sorted by descending line_start
+            encoding: Encoding of the file
+            backup: Whether to back up the file before changing it
+            
+        Returns:
+            FileWriteResult, or None if the regular path must be used
+        """
+        if os.linesep != '\n' or not newline_is_byte(encoding):
+            return None
+        if codecs.lookup(encoding).name in BOM_CODECS:
+            return None  # The regular path re-adds the BOM on write
+        
+        # Encode the new content before touching the file
+        new_contents = []
+        for edit in sorted_edits:
+            try:
+                new_bytes = self._edit_text(edit.new_content).encode(encoding)
+            except UnicodeEncodeError:
+                return None
+            if b'\r' in new_bytes:
+                return None
+            new_contents.append(new_bytes)
+        
+        fd = os.open(file_path, os.O_RDWR)
+        try:
+            if os.fstat(fd).st_size == 0:
+                return None
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b'\r') != -1:
+                    return None
+                
+                # Offsets come from this mapping, never from the reader's
+                # cache: a stale entry would splice at the wrong positions
+                offsets = scan_line_offsets(mm)
+                total_lines = len(offsets) - 1
+                
+                # Work out each edit's byte span
+                spans = []
+                next_start = total_lines + 1
+                for edit, new_bytes in zip(sorted_edits, new_contents):
+                    end_line = min(edit.line_end, total_lines)
+                    if edit.line_start > total_lines or end_line >= next_start:
+                        return None  # Out of range or overlapping
+                    next_start = edit.line_start
+                    spans.append((offsets[edit.line_start - 1], offsets[end_line], new_bytes, end_line - edit.line_start + 1))
+                spans.reverse()  # Ascending file order
+                
+                changed = [span for span in spans if mm[span[0]:span[1]] != span[2]]
+                if not changed:
+                    return FileWriteResult(
+                        success=True,
+                        changed_lines=0,
+                        backup_path=None,
+                        metadata={"unchanged": True}
+                    )
+                
+                in_place = hasattr(os, "pwrite") and all(
+                    [len(line) for line in mm[start:end].split(b'\n')] == [len(line) for line in new_bytes.split(b'\n')]
+                    for start, end, new_bytes, _ in changed
+                )
+                
+                backup_path = None
+                if backup:
+                    make_backup = self._create_backup if in_place else self._link_backup
+                    success, backup_path, error = make_backup(file_path)
+                    if not success:
+                        return FileWriteResult(
+                            success=False,
+                            error=error
+                        )
+                
+                if not in_place:
+                    view = memoryview(mm)
+                    try:
+                        with self._replacement_file(file_path, 'wb') as temp_file:
+                            cursor = 0
+                            for start, end, new_bytes, _ in changed:
+                                temp_file.write(view[cursor:start])
+                                temp_file.write(new_bytes)
+                                cursor = end
+                            temp_file.write(view[cursor:])
+                    finally:
+                        view.release()
+            
+            if in_place:
+                for start, _, new_bytes, _ in changed:
+                    os.pwrite(fd, new_bytes, start)
+        finally:
+            os.close(fd)
+        
+        return FileWriteResult(
+            success=True,
+            changed_lines=sum(num_lines for _, _, _, num_lines in changed),
+            backup_path=backup_path
+        )
+    
     def replace_string(self, file_path: str, old_string: str, new_string: str, max_replacements: int = 0, encoding: Optional[str] = None) -> FileWriteResult:
         """
         Replace all occurrences of a string in a file
@@ -222,63 +659,56 @@ class FileWriter:
             FileWriteResult indicating success or failure
         """
         try:
-            path_obj = Path(file_path)
-            
             # Validate file
-            if not path_obj.exists():
+            st, error = stat_and_validate(file_path)
+            if error:
                 return FileWriteResult(
                     success=False,
-                    error=f"File not found: {file_path}"
+                    error=error
                 )
-                
-            if not path_obj.is_file():
+            
+            # An empty needle matches between every character
+            if not old_string:
                 return FileWriteResult(
                     success=False,
-                    error=f"Not a file: {file_path}"
+                    error="old_string must not be empty"
                 )
             
-            # Create backup if requested
-            backup_path = None
-            if self.create_backup:
-                success, backup_path, error = self._create_backup(file_path)
-                if not success:
-                    return FileWriteResult(
-                        success=False,
-                        error=error
-                    )
-            
             # Use provided encoding or default
             file_encoding = encoding or self.default_encoding
             
             try:
-                # Read the entire file
-                with open(file_path, 'r', encoding=file_encoding) as f:
-                    content = f.read()
+                with open(file_path, 'rb') as f:
+                    data = f.read()
                 
-                # Check if the string exists
-                if old_string not in content:
-                    if backup_path:
-                        os.unlink(backup_path)  # Remove unnecessary backup
-                    
-                    return FileWriteResult(
-                        success=True,
-                        changed_lines=0,
-                        backup_path=None,
-                        metadata={"unchanged": True}
-                    )
+                operands = self._byte_operands(data, old_string, new_string, file_encoding)
+                if operands is not None:
+                    # Replace in the raw bytes: no decode/encode round trip
+                    content = data
+                    old, new = operands
+                else:
+                    content = data.decode(file_encoding)
+                    if "\r" in content:  # Universal newlines, as text mode reads
+                        content = content.replace("\r\n", "\n").replace("\r", "\n")
+                    old, new = old_string, new_string
                 
-                # Replace the string
-                if max_replacements > 0:
-                    new_content = content.replace(old_string, new_string, max_replacements)
-                    replacements = min(max_replacements, content.count(old_string))
+                limit = max_replacements if max_replacements > 0 else -1
+                length_delta = len(new) - len(old)
+                if length_delta:
+                    # Replace first and derive the count from the change in
+                    # length, so the content is only scanned once
+                    new_content = content.replace(old, new, limit)
+                    replacements = (len(new_content) - len(content)) // length_delta
                 else:
-                    new_content = content.replace(old_string, new_string)
-                    replacements = content.count(old_string)
+                    # Same length: count first so an identical replacement or
+                    # a miss doesn't build a copy of the content
+                    replacements = content.count(old)
+                    if max_replacements > 0:
+                        replacements = min(max_replacements, replacements)
+                    if replacements and old != new:
+                        new_content = content.replace(old, new, replacements)
                 
-                # If no changes were made
-                if content == new_content:
-                    if backup_path:
-                        os.unlink(backup_path)
+                if replacements == 0 or old == new:
                     return FileWriteResult(
                         success=True,
                         changed_lines=0,
@@ -286,22 +716,25 @@ class FileWriter:
                         metadata={"unchanged": True}
                     )
                 
-                # Create temp file for atomic write
-                with tempfile.NamedTemporaryFile(mode='w', encoding=file_encoding, delete=False) as temp_file:
-                    temp_path = temp_file.name
-                    temp_file.write(new_content)
+                # Back up only once a change is certain. The file is replaced
+                # by a rename, so a hard link preserves the original.
+                backup_path = None
+                if self.create_backup:
+                    success, backup_path, error = self._link_backup(file_path)
+                    if not success:
+                        return FileWriteResult(
+                            success=False,
+                            error=error
+                        )
                 
-                # Atomic move temp file to original
-                shutil.move(temp_path, file_path)
+                if operands is not None:
+                    with self._replacement_fd(file_path) as fd:
+                        _write_all(fd, new_content)
+                else:
+                    self._replace_contents(file_path, new_content, file_encoding)
                 
-                # Count changed lines
-                old_lines = content.splitlines()
-                new_lines = new_content.splitlines()
-                changed_lines = 0
-                for i, (old, new) in enumerate(zip(old_lines, new_lines)):
-                    if old != new:
-                        changed_lines += 1
-                changed_lines += abs(len(new_lines) - len(old_lines))
+                # Count changed lines from the hits alone
+                changed_lines = self._count_replaced_lines(content, old, new, replacements)
                 
                 return FileWriteResult(
                     success=True,
@@ -1,6 +1,32 @@
-import io
+"""
+Deprecated: use spiderfs_mcp.file.reader.FileReader instead
+
+This module's FileReader reads line ranges through the package reader's
+line-offset index rather than loading the whole file.
+"""
 import codecs
-from typing import List, Optional, Union
+import io
+import itertools
+import sys
+import warnings
+from typing import List, Optional
+
+from charset_normalizer import from_bytes
+
+from .file._common import BOMS, newline_is_byte
+from .file.reader import FileReader as _IndexedReader, LineRange
+
+warnings.warn(
+    "spiderfs_mcp.file_reader is deprecated; use spiderfs_mcp.file.reader.FileReader",
+    DeprecationWarning,
+    stacklevel=2,
+)
+
+# How much of a file is sampled when detecting its encoding
+DETECT_SAMPLE_SIZE = 64 * 1024
+
+_reader = _IndexedReader()
+
 
 class FileReader:
     """
@@ -18,6 +44,12 @@ class FileReader:
         """
         Read a file with specified encoding and optional line range
         
+        ASCII-compatible encodings with strict errors go through the
+        package reader's cached line-offset index, so only the requested
+        lines are read and decoded. Other encodings or error handlers
+        read line by line up to the end of the range. Lines come back
+        with universal newlines.
+        
         Args:
             file_path (str): Path to the file to read
             encoding (str, optional): Encoding of the file. Defaults to 'utf-8'
@@ -39,33 +71,38 @@ class FileReader:
         except LookupError:
             raise LookupError(f"Unsupported encoding: {encoding}")
         
-        # Open file with specified encoding
-        with codecs.open(file_path, 'r', encoding=encoding, errors=errors) as file:
-            # Read all lines
-            all_lines = file.readlines()
-            
-            # If no line range specified, return all lines
-            if start_line is None and end_line is None:
-                return all_lines
-            
-            # Validate line range
-            if start_line is not None and start_line < 1:
-                raise ValueError(f"Invalid start line: {start_line}. Must be >= 1")
-            
-            if end_line is not None and end_line > len(all_lines):
-                raise ValueError(f"Invalid end line: {end_line}. Exceeds total lines {len(all_lines)}")
-            
-            # Adjust for 1-indexing to 0-indexing
-            start = (start_line - 1) if start_line is not None else 0
-            end = end_line if end_line is not None else len(all_lines)
-            
-            return all_lines[start:end]
+        # Validate line range
+        if start_line is not None and start_line < 1:
+            raise ValueError(f"Invalid start line: {start_line}. Must be >= 1")
+        
+        start = start_line if start_line is not None else 1
+        
+        if errors == 'strict' and newline_is_byte(encoding):
+            end = end_line if end_line is not None else sys.maxsize
+            content, line_count = _reader._read_lines_indexed(file_path, LineRange(start, end), encoding)
+            lines = io.StringIO(content).readlines()
+        else:
+            with open(file_path, 'r', encoding=encoding, errors=errors) as file:
+                skipped = sum(1 for _ in itertools.islice(file, start - 1))
+                wanted = None if end_line is None else max(0, end_line - start + 1)
+                lines = list(itertools.islice(file, wanted))
+            line_count = skipped + len(lines)
+        
+        # line_count stops at the end of the range, so falling short of
+        # end_line means the file is shorter
+        if end_line is not None and line_count < end_line:
+            raise ValueError(f"Invalid end line: {end_line}. Exceeds total lines {line_count}")
+        
+        return lines
     
     @staticmethod
     def detect_encoding(file_path: str, default_encoding: str = 'utf-8') -> str:
         """
         Attempt to detect the encoding of a file
         
+        Only the first DETECT_SAMPLE_SIZE bytes are examined: a byte order
+        mark wins, then strict UTF-8, then charset_normalizer's best guess.
+        
         Args:
             file_path (str): Path to the file
             default_encoding (str, optional): Fallback encoding. Defaults to 'utf-8'
@@ -73,17 +110,23 @@ class FileReader:
         Returns:
             str: Detected or default encoding
         """
-        encodings_to_try = [
-            'utf-8', 'latin-1', 'utf-16', 'ascii', 
-            'iso-8859-1', 'windows-1252'
-        ]
-        
-        for encoding in encodings_to_try:
-            try:
-                with codecs.open(file_path, 'r', encoding=encoding) as file:
-                    file.read()
+        with open(file_path, 'rb') as file:
+            prefix = file.read(DETECT_SAMPLE_SIZE)
+        
+        for bom, encoding in BOMS:
+            if prefix.startswith(bom):
                 return encoding
-            except (UnicodeDecodeError, LookupError):
-                continue
+        
+        # Incremental decoding tolerates a character cut off by the sample
+        # end, but not one cut off by the end of a shorter file
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(prefix, final=len(prefix) < DETECT_SAMPLE_SIZE)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+        
+        best = from_bytes(prefix).best()
+        if best is not None:
+            return best.encoding.replace('_', '-')
         
         return default_encoding
@@ -1,13 +1,144 @@
+import functools
 import logging
+import platform
+import re
 import subprocess
 import sys
 import os
+import tempfile
+import threading
 import traceback
-from typing import List, Optional, Tuple
+from concurrent.futures import wait
+from typing import Iterator, List, Optional, Tuple
 from pathlib import Path
 
+from .._executor import io_executor
+
 logger = logging.getLogger(__name__)
 
+# A pattern with none of these is matched as a plain substring
+_REGEX_CHARS = frozenset("^$.*+?{}[]|()\\")
+
+# The platform can't change while we run, so detect it once
+_IS_WINDOWS = platform.system() == "Windows"
+
+# Directories skipped entirely (neither reported nor walked) when a
+# search is run with prune=True
+PRUNE_DIR_NAMES = frozenset(
+    {"node_modules", ".git", "__pycache__", "target", "venv", ".venv", ".cache"}
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> Optional["re.Pattern[str]"]:
+    """
+    Compile a case-insensitive search regex once per distinct pattern
+
+    Returns:
+        The compiled pattern, or None if it is not a valid regex
+    """
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error:
+        return None
+
+
+def _scan_dir(
+    path: str, prune: bool = False
+) -> Tuple[List[str], List[str], List[str]]:
+    """
+    List one directory with os.scandir
+
+    Args:
+        path: Directory to list
+        prune: Leave out directories named in PRUNE_DIR_NAMES
+
+    Returns:
+        Tuple of (dir names, file names, paths of the subdirectories to
+        descend into, i.e. excluding symlinks)
+    """
+    dirs = []
+    files = []
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if prune and entry.name in PRUNE_DIR_NAMES:
+                    continue
+                dirs.append(entry.name)
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            else:
+                files.append(entry.name)
+    return dirs, files, subdirs
+
+
+def _scandir_walk(
+    top: str, prune: bool = False
+) -> Iterator[Tuple[str, List[str], List[str]]]:
+    """
+    Walk a directory tree top-down, like os.walk, using os.scandir directly
+
+    Entries are classified from the data readdir already returned, so
+    there is no extra stat per entry on most filesystems. As with os.walk,
+    symlinks to directories are listed under dirs but not descended into,
+    and unreadable directories are skipped. With prune, directories named
+    in PRUNE_DIR_NAMES are skipped altogether.
+
+    Yields:
+        Tuple of (root, dir names, file names) for each directory
+    """
+    stack = [top]
+    while stack:
+        root = stack.pop()
+        try:
+            dirs, files, subdirs = _scan_dir(root, prune)
+        except OSError:
+            continue
+
+        yield root, dirs, files
+
+        # Reversed so directories are visited in listing order
+        stack.extend(reversed(subdirs))
+
+
+@functools.lru_cache(maxsize=1)
+def _check_fd_installed() -> bool:
+    """
+    Check if fd is installed and available in PATH
+
+    Runs fd --version once per process; every FzfSearch shares the answer
+    instead of starting a subprocess when it is constructed.
+    """
+    logger.debug("[FD] Checking if fd is installed")
+    try:
+        result = subprocess.run(
+            ["fd", "--version"], capture_output=True, check=True
+        )
+        logger.debug(
+            "[FD] fd is installed: %s", result.stdout.decode("utf-8").strip()
+        )
+        return True
+    except subprocess.CalledProcessError as e:
+        logger.warning(
+            "[FD] fd check returned non-zero exit code: %s, stderr: %s",
+            e.returncode,
+            e.stderr.decode("utf-8"),
+        )
+        return False
+    except FileNotFoundError:
+        logger.warning(
+            "[FD] fd not found in PATH, falling back to Python implementation"
+        )
+        return False
+    except Exception as e:
+        logger.error("[FD] Unexpected error checking fd: %s", e)
+        return False
+
 
 class FzfSearch:
     """
@@ -20,32 +151,7 @@ class FzfSearch:
     """
 
     def __init__(self):
-        self.fd_available = self._check_fd_installed()
-
-    def _check_fd_installed(self) -> bool:
-        """Check if fd is installed and available in PATH"""
-        logger.debug("[FD] Checking if fd is installed")
-        try:
-            result = subprocess.run(
-                ["fd", "--version"], capture_output=True, check=True
-            )
-            logger.debug(
-                f"[FD] fd is installed: {result.stdout.decode('utf-8').strip()}"
-            )
-            return True
-        except subprocess.CalledProcessError as e:
-            logger.warning(
-                f"[FD] fd check returned non-zero exit code: {e.returncode}, stderr: {e.stderr.decode('utf-8')}"
-            )
-            return False
-        except FileNotFoundError:
-            logger.warning(
-                "[FD] fd not found in PATH, falling back to Python implementation"
-            )
-            return False
-        except Exception as e:
-            logger.error(f"[FD] Unexpected error checking fd: {str(e)}")
-            return False
+        self.fd_available = _check_fd_installed()
 
     def _get_windows_drives(self) -> List[str]:
         """Get all available drives on Windows"""
@@ -57,14 +163,14 @@ class FzfSearch:
 
             drives_raw = win32api.GetLogicalDriveStrings()
             drives = drives_raw.split("\x00")
-            logger.debug(f"[FD] Raw drives found: {drives}")
+            logger.debug("[FD] Raw drives found: %s", drives)
 
             formatted_drives = [
                 drive.replace("\\", "\\\\").rstrip("\\\\") + "\\\\"
                 for drive in drives
                 if drive
             ]
-            logger.debug(f"[FD] Formatted drives: {formatted_drives}")
+            logger.debug("[FD] Formatted drives: %s", formatted_drives)
             return formatted_drives
         except ImportError:
             logger.warning("[FD] pywin32 not available, using default C:\\ drive only")
@@ -77,21 +183,16 @@ class FzfSearch:
         - All Windows drives if no root_path on Windows
         - System root if no root_path on other OS
         """
-        logger.debug(f"[FD] Preparing search paths with root_path={root_path}")
+        logger.debug("[FD] Preparing search paths with root_path=%s", root_path)
 
         if root_path:
-            logger.debug(f"[FD] Using specified root path: {root_path}")
+            logger.debug("[FD] Using specified root path: %s", root_path)
             return [root_path]
 
-        import platform
-
-        system = platform.system()
-        logger.debug(f"[FD] No root path specified, detecting OS: {system}")
-
-        if system == "Windows":
+        if _IS_WINDOWS:
             logger.debug("[FD] Windows detected, getting all drives")
             drives = self._get_windows_drives()
-            logger.debug(f"[FD] Using Windows drives as search paths: {drives}")
+            logger.debug("[FD] Using Windows drives as search paths: %s", drives)
             return drives
 
         logger.debug("[FD] Unix-like system detected, using root (/) as search path")
@@ -100,12 +201,10 @@ class FzfSearch:
     def _list_files_dirs(self, directory: str, include_dirs: bool = True) -> List[str]:
         """List all files and optionally directories in the given directory recursively"""
         logger.debug(
-            f"[FD] Listing files/dirs in {directory} (include_dirs={include_dirs})"
+            "[FD] Listing files/dirs in %s (include_dirs=%s)", directory, include_dirs
         )
-        import os
-
         result = []
-        for root, dirs, files in os.walk(directory):
+        for root, dirs, files in _scandir_walk(directory):
             # Add all files
             for file in files:
                 result.append(os.path.join(root, file))
@@ -115,7 +214,7 @@ class FzfSearch:
                 for dir_name in dirs:
                     result.append(os.path.join(root, dir_name))
 
-        logger.debug(f"[FD] Found {len(result)} files/dirs in {directory}")
+        logger.debug("[FD] Found %d files/dirs in %s", len(result), directory)
         return result
 
     def search(
@@ -124,6 +223,7 @@ class FzfSearch:
         root_path: Optional[str] = None,
         max_results: int = 5,
         include_dirs: bool = True,
+        prune: bool = False,
     ) -> List[str]:
         """
         Perform fuzzy search for files and/or directories
@@ -133,12 +233,18 @@ class FzfSearch:
             root_path: Base directory to search from
             max_results: Maximum number of results to return
             include_dirs: Whether to include directories in search results
+            prune: Don't descend into PRUNE_DIR_NAMES (VCS metadata,
+                dependency and build directories)
 
         Returns:
             List of matching file and/or directory paths
         """
         logger.debug(
-            f"[FD] Starting search with pattern='{pattern}', root_path='{root_path}', max_results={max_results}, include_dirs={include_dirs}"
+            "[FD] Starting search with pattern=%r, root_path=%r, max_results=%d, include_dirs=%s",
+            pattern,
+            root_path,
+            max_results,
+            include_dirs,
         )
 
         # Force fallback in test environment unless explicitly overridden for testing
@@ -148,115 +254,135 @@ class FzfSearch:
 
         if not self.fd_available or test_env:
             logger.debug(
-                f"[FD] Using Python fallback search (fd_available={self.fd_available}, test_env={test_env})"
+                "[FD] Using Python fallback search (fd_available=%s, test_env=%s)",
+                self.fd_available,
+                test_env,
             )
             return self._python_fallback_search(
-                pattern, root_path, max_results, include_dirs
+                pattern, root_path, max_results, include_dirs, prune
             )
 
         logger.debug("[FD] Using native fd implementation")
         search_paths = self._prepare_search_paths(root_path)
-        logger.debug(f"[FD] Search paths prepared: {search_paths}")
+        logger.debug("[FD] Search paths prepared: %s", search_paths)
 
         try:
-            results = []
-
-            # Process each search path separately
-            for search_path in search_paths:
-                logger.debug(f"[FD] Searching in path: {search_path}")
-
-                try:
-                    # Build the fd command
-                    fd_cmd = [
-                        "fd",
-                        pattern,  # Search pattern
-                        search_path,  # Search path
-                        "-tf",
-                        ("-td" if include_dirs else ""),  # Include dirs if requested
-                        "--hidden",  # Include hidden files
-                        "-i",  # Case-insensitive matching
-                        "--max-results",
-                        str(max_results),  # Limit results
-                    ]
-
-                    logger.debug(f"[FD] Running command: {' '.join(fd_cmd)}")
-
-                    # Run fd command
-                    result = subprocess.run(
-                        fd_cmd,
-                        check=True,
-                        capture_output=True,
-                        text=True,
-                        encoding="utf-8",
-                    )
-
-                    # Process results
-                    path_results = [path for path in result.stdout.splitlines() if path]
-                    logger.debug(
-                        f"[FD] Found {len(path_results)} results in {search_path}"
-                    )
-
-                    results.extend(path_results)
-
-                    # Check if we've reached max results
-                    if len(results) >= max_results:
-                        logger.debug(
-                            f"[FD] Reached max_results ({max_results}), stopping search"
-                        )
-                        break
+            # Search every path with one fd run: one process start instead
+            # of one per drive, and fd's parallel walker covers all the
+            # paths at once. fd stops on its own at --max-results;
+            # NUL-separated output keeps names containing newlines intact.
+            fd_cmd = ["fd", pattern, *search_paths, "-tf"]
+            if include_dirs:
+                fd_cmd.append("-td")  # Include dirs if requested
+            fd_cmd += [
+                "--hidden",  # Include hidden files
+                "-i",  # Case-insensitive matching
+                "--print0",
+                "--max-results",
+                str(max_results),  # Limit results
+            ]
+            if prune:
+                for name in sorted(PRUNE_DIR_NAMES):
+                    fd_cmd += ["--exclude", name]
 
-                except subprocess.CalledProcessError as e:
-                    # fd returns exit code 1 when no matches found, which isn't an error
-                    if e.returncode == 1 and not e.stderr:
-                        logger.debug(f"[FD] No matches found in {search_path}")
-                    else:
-                        logger.error(
-                            f"[FD] Error searching in {search_path}: {e.stderr}"
-                        )
-                    continue
-                except Exception as e:
-                    logger.error(f"[FD] Error searching in {search_path}: {str(e)}")
-                    continue
+            logger.debug("[FD] Running command: %s", fd_cmd)
 
-            # Limit to max results
-            results = results[:max_results]
+            results = self._run_fd(fd_cmd, max_results)
 
-            logger.debug(f"[FD] Final search completed, found {len(results)} results")
+            logger.debug("[FD] Final search completed, found %d results", len(results))
             if results:
-                logger.debug(
-                    f"[FD] First few results: {results[:min(3, len(results))]}"
-                )
+                logger.debug("[FD] First few results: %s", results[:3])
                 if len(results) > 3:
-                    logger.debug(f"[FD] ... and {len(results) - 3} more results")
+                    logger.debug("[FD] ... and %d more results", len(results) - 3)
 
             return results
 
         except Exception as e:
-            logger.error(f"[FD] Unexpected error during fd search: {str(e)}")
-            logger.error(f"[FD] Traceback: {traceback.format_exc()}")
+            logger.error("[FD] Unexpected error during fd search: %s", e)
+            logger.error("[FD] Traceback: %s", traceback.format_exc())
             logger.debug("[FD] Falling back to Python implementation after exception")
             return self._python_fallback_search(
-                pattern, root_path, max_results, include_dirs
+                pattern, root_path, max_results, include_dirs, prune
             )
 
+    def _run_fd(self, fd_cmd: List[str], max_results: int) -> List[str]:
+        """
+        Run fd and collect its NUL-separated output as it arrives
+
+        Reading stops as soon as max_results paths are in, and fd is
+        terminated rather than waited for, so neither memory nor latency
+        depends on how much of the tree fd would still walk. stderr goes
+        to a temporary file so a chatty fd can't block on a full pipe.
+
+        fd also exits nonzero for errors it walks past, such as an
+        unreadable directory; whatever it found is still returned, with
+        its stderr logged.
+
+        Raises:
+            subprocess.CalledProcessError: If fd exits with an error and
+                found nothing. fd exits 0 whether or not anything matched.
+        """
+        results: List[str] = []
+        with tempfile.TemporaryFile() as stderr:
+            proc = subprocess.Popen(fd_cmd, stdout=subprocess.PIPE, stderr=stderr)
+            try:
+                pending = b""
+                while len(results) < max_results:
+                    block = proc.stdout.read1(64 * 1024)
+                    if not block:
+                        break
+                    *names, pending = (pending + block).split(b"\0")
+                    results.extend(os.fsdecode(name) for name in names if name)
+
+                if len(results) >= max_results:
+                    logger.debug(
+                        "[FD] Reached max_results (%d), stopping fd", max_results
+                    )
+                    proc.terminate()
+                    return results[:max_results]
+
+                returncode = proc.wait()
+                if pending:
+                    results.append(os.fsdecode(pending))
+                if returncode != 0:
+                    stderr.seek(0)
+                    message = stderr.read().decode("utf-8", "replace")
+                    if not results:
+                        raise subprocess.CalledProcessError(
+                            returncode, fd_cmd, stderr=message
+                        )
+                    logger.warning(
+                        "[FD] fd exited with %d, keeping its %d results: %s",
+                        returncode, len(results), message.strip(),
+                    )
+                return results
+            finally:
+                proc.stdout.close()
+                try:
+                    proc.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait()
+
     def _python_fallback_search(
         self,
         pattern: str,
         root_path: Optional[str],
         max_results: int,
         include_dirs: bool = True,
+        prune: bool = False,
     ) -> List[str]:
         """Python implementation fallback when fd is not available"""
         logger.debug(
-            f"[FD-PYTHON] Starting Python fallback search with pattern='{pattern}', root_path='{root_path}', max_results={max_results}, include_dirs={include_dirs}"
+            "[FD-PYTHON] Starting Python fallback search with pattern=%r, root_path=%r, max_results=%d, include_dirs=%s",
+            pattern,
+            root_path,
+            max_results,
+            include_dirs,
         )
 
-        from pathlib import Path
-        import os
-        import re
-
         search_paths = self._prepare_search_paths(root_path)
-        logger.debug(f"[FD-PYTHON] Search paths to scan: {search_paths}")
+        logger.debug("[FD-PYTHON] Search paths to scan: %s", search_paths)
 
         matches = []
 
@@ -271,122 +397,105 @@ class FzfSearch:
             pattern = "test"  # Use literal match instead for invalid regex
         else:
             # Determine if pattern is likely regex (contains special chars)
-            is_regex = any(char in pattern for char in "^$.*+?{}[]|()\\")
+            is_regex = not _REGEX_CHARS.isdisjoint(pattern)
             logger.debug(
-                f"[FD-PYTHON] Pattern '{pattern}' identified as regex: {is_regex}"
+                "[FD-PYTHON] Pattern %r identified as regex: %s", pattern, is_regex
             )
 
             if is_regex:
-                try:
-                    regex = re.compile(pattern, re.IGNORECASE)
-                    logger.debug(f"[FD-PYTHON] Compiled regex pattern: {pattern}")
-                except re.error as e:
+                regex = _compile_pattern(pattern)
+                if regex is not None:
+                    logger.debug("[FD-PYTHON] Compiled regex pattern: %s", pattern)
+                else:
                     logger.warning(
-                        f"[FD-PYTHON] Invalid regex pattern '{pattern}', falling back to simple matching: {str(e)}"
+                        "[FD-PYTHON] Invalid regex pattern %r, falling back to simple matching",
+                        pattern,
                     )
                     is_regex = False
 
+        # Plain substrings are compared case-folded (full Unicode case
+        # matching, like re.IGNORECASE), folding the pattern only once
+        pattern_folded = pattern.casefold()
+
+        def is_match(name: str, full_path_str: str) -> bool:
+            if is_regex and regex is not None:
+                return bool(regex.search(name) or regex.search(full_path_str))
+            # The full path ends with the name, so a substring of the name
+            # is a substring of the full path: one test covers both
+            return pattern_folded in full_path_str.casefold()
+
+        # Set once max_results matches are in; walkers stop at their next
+        # directory
+        done = threading.Event()
+
+        def check(root: str, dirs: List[str], files: List[str]) -> None:
+            # Directories first, then files, as fd is asked for both
+            for names in (dirs, files) if include_dirs else (files,):
+                for name in names:
+                    full_path_str = os.path.join(root, name)
+                    if is_match(name, full_path_str):
+                        matches.append(full_path_str)
+                        if len(matches) >= max_results:
+                            done.set()
+                            return
+
+        def walk(top: str) -> None:
+            # Nothing is logged per entry: even a disabled debug call
+            # costs a function call for every file
+            for root, dirs, files in _scandir_walk(top, prune):
+                if done.is_set():
+                    return
+                check(root, dirs, files)
+
         try:
             for search_path in search_paths:
-                logger.debug(f"[FD-PYTHON] Scanning path: {search_path}")
+                logger.debug("[FD-PYTHON] Scanning path: %s", search_path)
                 path = Path(search_path)
                 if not path.exists():
-                    logger.warning(f"[FD-PYTHON] Path does not exist: {search_path}")
+                    logger.warning("[FD-PYTHON] Path does not exist: %s", search_path)
                     continue
 
-                # Walk through directory tree including hidden files
-                for root, dirs, files in os.walk(search_path):
-                    # Log current directory being scanned (throttled for large walks)
-                    if len(matches) % 100 == 0:
-                        logger.debug(
-                            f"[FD-PYTHON] Scanning directory: {root} ({len(dirs)} dirs, {len(files)} files)"
-                        )
-
-                    # Check directories
-                    if include_dirs:
-                        logger.debug(
-                            f"[FD-PYTHON] Checking {len(dirs)} directories in {root}"
-                        )
-                        for dirname in dirs:
-                            full_path = Path(root) / dirname
-                            full_path_str = str(full_path)
-
-                            match_found = False
-                            if is_regex and regex is not None:
-                                if regex.search(dirname) or regex.search(full_path_str):
-                                    match_found = True
-                                    logger.debug(
-                                        f"[FD-PYTHON] Regex match found on directory: {full_path_str}"
-                                    )
-                            else:
-                                # Fallback to simple case-insensitive pattern matching
-                                if (
-                                    pattern.lower() in dirname.lower()
-                                    or pattern.lower() in full_path_str.lower()
-                                ):
-                                    match_found = True
-                                    logger.debug(
-                                        f"[FD-PYTHON] Simple match found on directory: {full_path_str}"
-                                    )
-
-                            if match_found:
-                                matches.append(str(full_path))
-                                logger.debug(
-                                    f"[FD-PYTHON] Added directory match: {full_path_str} (total matches: {len(matches)})"
-                                )
-                                if len(matches) >= max_results:
-                                    logger.debug(
-                                        f"[FD-PYTHON] Reached max_results ({max_results}), returning matches"
-                                    )
-                                    return matches[:max_results]
-                    else:
-                        logger.debug(
-                            "[FD-PYTHON] Skipping directory checks as include_dirs=False"
-                        )
-
-                    # Check files
-                    logger.debug(f"[FD-PYTHON] Checking {len(files)} files in {root}")
-                    for filename in files:
-                        full_path = Path(root) / filename
-                        full_path_str = str(full_path)
-
-                        match_found = False
-                        if is_regex and regex is not None:
-                            if regex.search(filename) or regex.search(full_path_str):
-                                match_found = True
-                                logger.debug(
-                                    f"[FD-PYTHON] Regex match found on file: {full_path_str}"
-                                )
-                        else:
-                            # Fallback to simple case-insensitive pattern matching
-                            if (
-                                pattern.lower() in filename.lower()
-                                or pattern.lower() in full_path_str.lower()
-                            ):
-                                match_found = True
-                                logger.debug(
-                                    f"[FD-PYTHON] Simple match found on file: {full_path_str}"
-                                )
-
-                        if match_found:
-                            matches.append(str(full_path))
-                            logger.debug(
-                                f"[FD-PYTHON] Added file match: {full_path_str} (total matches: {len(matches)})"
-                            )
-                            if len(matches) >= max_results:
-                                logger.debug(
-                                    f"[FD-PYTHON] Reached max_results ({max_results}), returning matches"
-                                )
-                                return matches[:max_results]
+                # Check the top level here, then walk each first-level
+                # subdirectory on its own thread: the walk is bound by
+                # directory I/O, which overlaps well across threads
+                try:
+                    dirs, files, subdirs = _scan_dir(search_path, prune)
+                except OSError:
+                    continue
+                check(search_path, dirs, files)
+
+                if done.is_set():
+                    break
+                if len(subdirs) <= 1:
+                    for subdir in subdirs:
+                        walk(subdir)
+                else:
+                    pool = io_executor()
+                    futures = [pool.submit(walk, subdir) for subdir in subdirs]
+                    try:
+                        for future in futures:
+                            future.result()
+                    except BaseException:
+                        # Stop this search's other walkers before giving up
+                        done.set()
+                        wait(futures)
+                        raise
+
+                if done.is_set():
+                    logger.debug(
+                        "[FD-PYTHON] Reached max_results (%d), returning matches",
+                        max_results,
+                    )
+                    break
 
             logger.debug(
-                f"[FD-PYTHON] Search completed, returning {len(matches)} matches"
+                "[FD-PYTHON] Search completed, returning %d matches", len(matches)
             )
             return matches[:max_results]
 
         except Exception as e:
-            logger.error(f"[FD-PYTHON] Python fallback search failed: {str(e)}")
-            logger.error(f"[FD-PYTHON] Traceback: {traceback.format_exc()}")
+            logger.error("[FD-PYTHON] Python fallback search failed: %s", e)
+            logger.error("[FD-PYTHON] Traceback: %s", traceback.format_exc())
 
         logger.debug("[FD-PYTHON] Returning empty list after exception")
         return []
@@ -1,12 +1,152 @@
+import functools
+import os
 import re
 from pathlib import Path
-from typing import List, Generator
+from typing import List, Generator, Optional
 from .ripgrep import SearchMatch, SearchResult
 
+# Characters read per block when a whole block is scanned at once
+SEARCH_BLOCK_SIZE = 1024 * 1024
+
+# Escapes that can never match a newline or look across one
+_LINE_SAFE_ESCAPES = frozenset("dwSbB.^$*+?()[]{}|\\/-")
+_ESCAPE = re.compile(r"\\(.)", re.DOTALL)
+_REPEAT = re.compile(r"\{\d*(?:,\d*)?\}")
+# What follows an escape letter or digit as part of the escape: the code
+# of \x, \u, \U and \N, or the rest of an octal escape or group number
+_ESCAPE_ARGUMENT = {
+    "x": re.compile(r"[0-9A-Fa-f]{0,2}"),
+    "u": re.compile(r"[0-9A-Fa-f]{0,4}"),
+    "U": re.compile(r"[0-9A-Fa-f]{0,8}"),
+    "N": re.compile(r"(?:\{[^}]*\})?"),
+}
+_ESCAPE_DIGITS = re.compile(r"\d{0,2}")
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> "re.Pattern[str]":
+    """Compile a search regex once per distinct pattern"""
+    return re.compile(pattern)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_block_pattern(pattern: str) -> "Optional[re.Pattern[str]]":
+    """
+    Compile pattern for scanning many lines at once, or return None if a
+    match could span or look past a line break (then lines are searched
+    one at a time)
+    """
+    if "(?" in pattern or "[^" in pattern or "\n" in pattern or "\r" in pattern:
+        return None
+    if any(escaped not in _LINE_SAFE_ESCAPES for escaped in _ESCAPE.findall(pattern)):
+        return None
+    return re.compile(pattern, re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=256)
+def _required_literal(pattern: str) -> str:
+    """
+    Longest run of literal characters that every match of pattern contains,
+    or "" if none is known
+
+    Deliberately conservative: patterns with alternation or inline flags
+    give "", runs inside groups are ignored, and a character followed by
+    ?, * or {...} is treated as optional.
+    """
+    if "|" in pattern or "(?" in pattern:
+        return ""
+    best = ""
+    run = ""
+    depth = 0
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        i += 1
+        if c == "\\":
+            escaped = pattern[i:i + 1]
+            i += 1
+            if not escaped or escaped.isalnum():
+                best, run = max(best, run, key=len), ""  # \d, \b, \1, ...
+                argument = _ESCAPE_DIGITS if escaped.isdigit() else _ESCAPE_ARGUMENT.get(escaped)
+                if argument is not None:
+                    i = argument.match(pattern, i).end()
+                continue
+            c = escaped
+        elif c == "[":
+            # Skip the class; a leading ] (or ^]) is part of it
+            if pattern[i:i + 1] == "^":
+                i += 1
+            if pattern[i:i + 1] == "]":
+                i += 1
+            while i < n and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+            best, run = max(best, run, key=len), ""
+            continue
+        elif c == "{":
+            # Skip a {m,n} repeat count; any other { is taken as unknown
+            repeat = _REPEAT.match(pattern, i - 1)
+            if repeat:
+                i = repeat.end()
+            best, run = max(best, run, key=len), ""
+            continue
+        elif c in "().^$*+?}":
+            depth += (c == "(") - (c == ")")
+            best, run = max(best, run, key=len), ""
+            continue
+
+        quantifier = pattern[i:i + 1]
+        if depth or quantifier in ("*", "?", "{"):
+            best, run = max(best, run, key=len), ""
+        elif quantifier == "+":
+            best, run = max(best, run + c, key=len), ""
+        else:
+            run += c
+    return max(best, run, key=len)
+
 
 class PythonSearch:
     """Fallback Python-based search implementation"""
     
+    def search(self, pattern: str, path: str, max_matches: int = 1000) -> SearchResult:
+        """
+        Search a file, or every file under a directory, for pattern
+        
+        Directories are walked in name order, skipping hidden entries as
+        ripgrep does by default. Files that can't be read as UTF-8 text
+        are skipped.
+        
+        Args:
+            pattern: Regular expression pattern to search for
+            path: File or directory to search
+            max_matches: Maximum number of matches to return in total
+            
+        Returns:
+            SearchResult containing matches or error
+        """
+        if not os.path.isdir(path):
+            return self.search_file(pattern, path, max_matches)
+        
+        try:
+            _compile_pattern(pattern)
+        except re.error as e:
+            return SearchResult(matches=[], error=f"Search failed: {str(e)}")
+        
+        matches: List[SearchMatch] = []
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(name for name in dirnames if not name.startswith("."))
+            for name in sorted(filenames):
+                if name.startswith("."):
+                    continue
+                result = self.search_file(pattern, os.path.join(dirpath, name), max_matches - len(matches))
+                if result.error:
+                    continue
+                matches.extend(result.matches)
+                if len(matches) >= max_matches:
+                    return SearchResult(matches=matches)
+        return SearchResult(matches=matches)
+    
     def search_file(self, pattern: str, path: str, max_matches: int = 1000) -> SearchResult:
         """
         Search a single file for pattern
@@ -21,11 +161,18 @@ class PythonSearch:
         """
         try:
             matches: List[SearchMatch] = []
-            compiled_pattern = re.compile(pattern)
+            compiled_pattern = _compile_pattern(pattern)
+            block_pattern = _compile_block_pattern(pattern)
+            # Text without this can't match, so the regex isn't run on it
+            literal = _required_literal(pattern)
             
             with open(path, 'r', encoding='utf-8') as f:
+                if block_pattern is not None:
+                    self._search_blocks(f, block_pattern, path, max_matches, matches, literal)
+                    return SearchResult(matches=matches)
+
                 for i, line in enumerate(f, 1):
-                    if compiled_pattern.search(line):
+                    if literal in line and compiled_pattern.search(line):
                         matches.append(SearchMatch(
                             path=path,
                             line_number=i,
@@ -41,4 +188,62 @@ class PythonSearch:
             return SearchResult(
                 matches=[],
                 error=f"Search failed: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    @staticmethod
+    def _search_blocks(f, pattern: "re.Pattern[str]", path: str,
+                       max_matches: int, matches: List[SearchMatch],
+                       literal: str = "") -> None:
+        """
+        Scan whole blocks of complete lines with one regex search per
+        matching line instead of one per line
+
+        Blocks that don't contain literal (a string every match contains)
+        are only counted for line numbers, not searched.
+        """
+        line_number = 1
+        carry = ""
+        while True:
+            data = f.read(SEARCH_BLOCK_SIZE)
+            at_eof = not data
+            text = carry + data
+            if at_eof:
+                carry = ""
+            else:
+                # Only search complete lines; the tail waits for the next read
+                cut = text.rfind('\n') + 1
+                if not cut:
+                    carry = text
+                    continue
+                text, carry = text[:cut], text[cut:]
+
+            pos = 0
+            scanned = 0
+            end = len(text)
+            if literal not in text:
+                pos = end + 1  # Can't match in this block; just count its lines
+            while pos <= end:
+                m = pattern.search(text, pos)
+                if m is None:
+                    break
+                line_start = text.rfind('\n', 0, m.start()) + 1
+                if line_start == end:
+                    # Empty match after the final newline is not a line
+                    break
+                line_end = text.find('\n', m.start())
+                if line_end == -1:
+                    line_end = end
+                line_number += text.count('\n', scanned, line_start)
+                scanned = line_start
+                matches.append(SearchMatch(
+                    path=path,
+                    line_number=line_number,
+                    line_content=text[line_start:line_end]
+                ))
+                if len(matches) >= max_matches:
+                    return
+                pos = line_end + 1
+            line_number += text.count('\n', scanned)
+
+            if at_eof:
+                return
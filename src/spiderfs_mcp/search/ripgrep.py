@@ -1,10 +1,27 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple, TypeVar
+import asyncio
+import base64
+import json
+import shutil
 import subprocess
-from pathlib import Path
+import threading
 
+# orjson is optional; fall back to the standard library parser
+try:
+    import orjson
 
-@dataclass
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Upper bound for a single line of `rg --json` output read by search_async
+_STREAM_LINE_LIMIT = 16 * 1024 * 1024
+
+_T = TypeVar("_T")
+
+
+@dataclass(slots=True)
 class SearchMatch:
     """Represents a single search match"""
 
@@ -13,7 +30,7 @@ class SearchMatch:
     path: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Container for search results"""
 
@@ -21,15 +38,109 @@ class SearchResult:
     error: Optional[str] = None
 
 
+@dataclass(slots=True)
+class TextSearchResult:
+    """Search results already formatted as path:line_number:line_content lines"""
+
+    text: str
+    error: Optional[str] = None
+
+
+def _json_text(value: dict) -> str:
+    """Extract text from an rg --json string field (text, or base64 bytes if not UTF-8)"""
+    if "text" in value:
+        return value["text"]
+    return base64.b64decode(value.get("bytes", "")).decode("utf-8", errors="replace")
+
+
 class RipgrepSearch:
-    def __init__(self, executable_path: str = "rg"):
-        """Initialize ripgrep search with optional custom executable path"""
-        self.executable = executable_path
+    def __init__(self, executable_path: str = "rg", in_process: bool = False):
+        """
+        Initialize ripgrep search with optional custom executable path
+
+        With in_process, searches run on PythonSearch in this process
+        instead of starting ripgrep, which saves the process start-up on
+        every call at the cost of ripgrep's faster matching and its
+        .gitignore handling.
+        """
+        # Look rg up on PATH once here instead of on every exec; a name
+        # that isn't found is kept, so the error shows up when searching
+        self.executable = shutil.which(executable_path) or executable_path
+        # Everything before the per-search arguments
+        self._base_command = (
+            self.executable,
+            "--json",  # One JSON event per line
+            "-m",  # Limit number of matches (per file)
+        )
+        self.in_process = in_process
+        if in_process:
+            from .python_search import PythonSearch  # It imports this module
+
+            self._python_search = PythonSearch()
+
+    def _build_command(self, pattern: str, path: str, max_matches: int) -> List[str]:
+        """Build the ripgrep command line"""
+        return [*self._base_command, str(max_matches), "-e", pattern, path]
+
+    @staticmethod
+    def _match_fields(line) -> Optional[Tuple[str, int, str]]:
+        """
+        Parse one line of `rg --json` output
+
+        Returns:
+            Tuple of (path, line number, line content) for "match" events,
+            None for other events or bad lines
+        """
+        try:
+            event = _json_loads(line)
+            if event.get("type") != "match":
+                return None
+            data = event["data"]
+            return (
+                _json_text(data["path"]),
+                data.get("line_number") or 0,
+                _json_text(data["lines"]).rstrip("\r\n"),
+            )
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    @classmethod
+    def _parse_json_line(cls, line) -> Optional[SearchMatch]:
+        """
+        Parse one line of `rg --json` output
+
+        Returns:
+            SearchMatch for "match" events, None for other events or bad lines
+        """
+        fields = cls._match_fields(line)
+        if fields is None:
+            return None
+        path, line_number, line_content = fields
+        return SearchMatch(
+            path=path, line_number=line_number, line_content=line_content
+        )
+
+    @classmethod
+    def _format_json_line(cls, line) -> Optional[str]:
+        """
+        Format one line of `rg --json` output as path:line_number:line_content
+
+        Returns:
+            The formatted match for "match" events, None for other events or
+            bad lines
+        """
+        fields = cls._match_fields(line)
+        if fields is None:
+            return None
+        return "%s:%d:%s" % fields
 
     def search(self, pattern: str, path: str, max_matches: int = 1000) -> SearchResult:
         """
         Search for pattern in path using ripgrep
 
+        Output is parsed as it arrives and ripgrep is terminated as soon as
+        max_matches matches in total have been collected.
+
         Args:
             pattern: Regular expression pattern to search for
             path: Path to search in
@@ -38,100 +149,165 @@ class RipgrepSearch:
         Returns:
             SearchResult containing matches or error
         """
-        try:
-            # Build ripgrep command
-            cmd = [
-                self.executable,
-                "--line-number",  # Show line numbers
-                "--no-heading",  # Don't group matches by file
-                "-m",
-                str(max_matches),  # Limit number of matches
-                pattern,
-                path,
-            ]
-
-            # Run ripgrep
-            process = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=False,  # Don't raise on non-zero exit (no matches)
-            )
+        if self.in_process:
+            return self._python_search.search(pattern, path, max_matches)
 
-            # Handle error cases
-            if (
-                process.returncode != 0 and process.returncode != 1
-            ):  # 1 means no matches
-                return SearchResult(
-                    matches=[], error=f"ripgrep error: {process.stderr}"
+        try:
+            with subprocess.Popen(
+                self._build_command(pattern, path, max_matches),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            ) as process:
+                # Drain stderr alongside so a full pipe can't stall ripgrep
+                stderr_chunks: List[bytes] = []
+                stderr_reader = threading.Thread(
+                    target=lambda: stderr_chunks.append(process.stderr.read()),
+                    daemon=True,
                 )
+                stderr_reader.start()
 
-            # Parse results
-            matches = []
-            for line in process.stdout.splitlines():
-                if not line:
-                    continue
-
-                # Parse ripgrep output format: file:line:content
-                # For Windows compatibility, handle drive letters (e.g., C:) in paths
-                try:
-                    # Initialize variables to avoid unbound variable issues
-                    path_part = ""
-                    line_num = 0
-                    content = ""
-
-                    # Split only on the first colon for the path
-                    if ":" in line:
-                        # Handle Windows paths (e.g., C:\path\file.txt:10:content)
-                        if Path(line.split(":", 1)[0] + ":").drive:
-                            # Windows path with drive letter
-                            path_part = line.split(":", 1)[0] + ":"
-                            rest = line.split(":", 1)[1]
-                            path_part += rest.split(":", 1)[0]
-
-                            # Now split the rest to get line number and content
-                            rest_parts = rest.split(":", 1)
-
-                            if len(rest_parts) < 2:
-                                continue
-
-                            content_parts = rest_parts[1].split(":", 1)
-                            line_part = (
-                                content_parts[0] if len(content_parts) > 1 else ""
-                            )
-                            content = content_parts[1] if len(content_parts) > 1 else ""
-                            line_num = int(line_part) if line_part.isdigit() else 0
-                        else:
-                            # Unix path (no drive letter)
-                            parts = line.split(":", 2)
-                            if len(parts) < 2:
-                                # Not enough parts, skip this line
-                                continue
-
-                            path_part = parts[0]
-                            try:
-                                line_num = int(parts[1])
-                            except ValueError:
-                                # Not a valid line number, skip this line
-                                continue
-                            content = parts[2] if len(parts) > 2 else ""
-                    else:
-                        # Fall back if no colon (shouldn't happen with ripgrep)
+                # Parse results as they arrive; paths come from JSON, so
+                # drive letters need no special casing. -m only limits
+                # matches per file, so stop ripgrep once enough are in.
+                matches = []
+                stopped = False
+                for line in process.stdout:
+                    match = self._parse_json_line(line)
+                    if match is None:
                         continue
+                    matches.append(match)
+                    if len(matches) >= max_matches:
+                        stopped = True
+                        process.terminate()
+                        break
 
-                    matches.append(
-                        SearchMatch(
-                            path=path_part,
-                            line_number=line_num,
-                            line_content=content,
-                        )
-                    )
-                except Exception as e:
-                    # Add debugging info if needed
-                    print(f"Error parsing line '{line}': {str(e)}")
-                    continue
+                returncode = process.wait()
+                stderr_reader.join()
+
+            # Handle error cases
+            if not stopped and returncode != 0 and returncode != 1:  # 1 means no matches
+                stderr = b"".join(stderr_chunks).decode("utf-8", errors="replace")
+                return SearchResult(matches=[], error=f"ripgrep error: {stderr}")
 
             return SearchResult(matches=matches)
 
         except Exception as e:
             return SearchResult(matches=[], error=f"Search failed: {str(e)}")
+
+    async def search_async(
+        self, pattern: str, path: str, max_matches: int = 1000
+    ) -> SearchResult:
+        """
+        Search for pattern in path using ripgrep without blocking the event loop
+
+        Output is parsed as it arrives and ripgrep is terminated as soon as
+        max_matches matches in total have been collected.
+
+        Args:
+            pattern: Regular expression pattern to search for
+            path: Path to search in
+            max_matches: Maximum number of matches to return
+
+        Returns:
+            SearchResult containing matches or error
+        """
+        if self.in_process:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._python_search.search, pattern, path, max_matches
+            )
+
+        matches, error = await self._collect_async(
+            pattern, path, max_matches, self._parse_json_line
+        )
+        return SearchResult(matches=matches, error=error)
+
+    async def search_text_async(
+        self, pattern: str, path: str, max_matches: int = 1000
+    ) -> TextSearchResult:
+        """
+        Like search_async, but return the matches as newline-separated
+        path:line_number:line_content text
+
+        Each match is formatted straight from ripgrep's JSON, without a
+        SearchMatch per match, and the text is joined once at the end.
+
+        Args:
+            pattern: Regular expression pattern to search for
+            path: Path to search in
+            max_matches: Maximum number of matches to return
+
+        Returns:
+            TextSearchResult containing the formatted matches or error
+        """
+        if self.in_process:
+            result = await self.search_async(pattern, path, max_matches)
+            return TextSearchResult(
+                text="\n".join(
+                    "%s:%d:%s" % (match.path, match.line_number, match.line_content)
+                    for match in result.matches
+                ),
+                error=result.error,
+            )
+
+        lines, error = await self._collect_async(
+            pattern, path, max_matches, self._format_json_line
+        )
+        return TextSearchResult(text="\n".join(lines), error=error)
+
+    async def _collect_async(
+        self,
+        pattern: str,
+        path: str,
+        max_matches: int,
+        parse: Callable[[bytes], Optional[_T]],
+    ) -> Tuple[List[_T], Optional[str]]:
+        """
+        Run ripgrep and collect parse(line) for each match event
+
+        Returns:
+            Tuple of (parsed matches, error message or None). The matches
+            are empty when there is an error.
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self._build_command(pattern, path, max_matches),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=_STREAM_LINE_LIMIT,
+            )
+        except Exception as e:
+            return [], f"Search failed: {str(e)}"
+
+        # Drain stderr concurrently so a full pipe can't stall ripgrep
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+        matches = []
+        error = None
+        stopped = True  # Cleared only when ripgrep ran to completion
+        try:
+            async for line in process.stdout:
+                match = parse(line)
+                if match is None:
+                    continue
+                matches.append(match)
+                if len(matches) >= max_matches:
+                    break
+            else:
+                stopped = False
+        except Exception as e:
+            error = f"Search failed: {str(e)}"
+        finally:
+            if stopped and process.returncode is None:
+                try:
+                    process.terminate()
+                except ProcessLookupError:
+                    pass
+            returncode = await process.wait()
+            stderr = await stderr_task
+
+        if error:
+            return [], error
+
+        if not stopped and returncode != 0 and returncode != 1:  # 1 means no matches
+            return [], f"ripgrep error: {stderr.decode('utf-8', errors='replace')}"
+
+        return matches, None
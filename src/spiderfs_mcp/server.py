@@ -1,7 +1,12 @@
+import asyncio
+import functools
 import logging
 import os
 import sys
-import traceback
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -10,16 +15,71 @@ from mcp.types import (
     Tool,
 )
 from dataclasses import dataclass
-from typing import List, Optional, Any, Dict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ._executor import IO_MAX_WORKERS
+from .file.reader import FileReader
+from .file.writer import FileWriter, LineEdit
+from .search.fzf import FzfSearch
+from .search.ripgrep import RipgrepSearch
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(message)s",
-    handlers=[logging.FileHandler("spiderfs_debug.log"), logging.StreamHandler()],
-)
 logger = logging.getLogger(__name__)
 
+# Stateless backends shared by every request
+_READER = FileReader()
+_WRITER = FileWriter()
+# SPIDERFS_IN_PROCESS_SEARCH runs search_content in-process instead of
+# starting ripgrep for every call
+_RIPGREP = RipgrepSearch(in_process=bool(os.environ.get("SPIDERFS_IN_PROCESS_SEARCH")))
+
+
+@functools.lru_cache(maxsize=1)
+def _fuzzy_searcher() -> FzfSearch:
+    """
+    The shared FzfSearch, built on first use
+
+    Constructing it probes for fd with a subprocess, which importing the
+    package (e.g. just for the file helpers) shouldn't do.
+    """
+    return FzfSearch()
+
+
+# Content searches allowed to run at once. Each one is an rg process (or a
+# CPU-bound in-process scan); more than one per core only adds memory and
+# contention, so further calls wait for a slot.
+SEARCH_MAX_CONCURRENCY = os.cpu_count() or 4
+_search_slots = asyncio.Semaphore(SEARCH_MAX_CONCURRENCY)
+
+# Recent fuzzy search results, keyed by the search arguments. Clients
+# often repeat a query (or re-send it while typing), and a repeat within
+# FUZZY_CACHE_TTL seconds is answered without walking the tree again.
+# Writes and edits through this server clear the cache; changes made by
+# other processes show up once the entry expires.
+FUZZY_CACHE_TTL = 5.0
+FUZZY_CACHE_SIZE = 128
+_fuzzy_cache: "OrderedDict[tuple, Tuple[float, Tuple[str, ...]]]" = OrderedDict()
+_fuzzy_cache_lock = threading.Lock()
+
+
+def _clear_fuzzy_cache() -> None:
+    with _fuzzy_cache_lock:
+        _fuzzy_cache.clear()
+
+
+# Recent search_content replies, keyed by pattern, path and the path's
+# mtime and size. The stat catches edits to a searched file at once; for
+# directories, changes by other processes show up after CONTENT_CACHE_TTL
+# seconds, like the fuzzy cache.
+CONTENT_CACHE_TTL = 5.0
+CONTENT_CACHE_SIZE = 128
+_content_cache: "OrderedDict[tuple, Tuple[float, str]]" = OrderedDict()
+_content_cache_lock = threading.Lock()
+
+
+def _clear_content_cache() -> None:
+    with _content_cache_lock:
+        _content_cache.clear()
+
 
 @dataclass
 class ContentSearch:
@@ -33,6 +93,7 @@ class FuzzyFileSearch:
     root_path: Optional[str] = None
     max_results: int = 5
     include_dirs: bool = True
+    prune: bool = False
 
 
 @dataclass
@@ -65,6 +126,7 @@ def fuzzy_file_search(
     root_path: Optional[str] = None,
     max_results: int = 5,
     include_dirs: bool = True,
+    prune: bool = False,
 ) -> List[str]:
     """
     Search for files and/or directories using fuzzy matching
@@ -73,67 +135,99 @@ def fuzzy_file_search(
         root_path: Base directory to search from (None = system root)
         max_results: Maximum number of results to return
         include_dirs: Whether to include directories in search results
+        prune: Skip VCS metadata, dependency and build directories
     Returns:
         List of matching file and/or directory paths
     """
     logger.debug(
-        f"[FUZZY_SEARCH] Starting fuzzy_file_search with params: pattern='{pattern}', root_path='{root_path}', max_results={max_results}, include_dirs={include_dirs}"
+        "[FUZZY_SEARCH] Starting fuzzy_file_search with params: pattern=%r, root_path=%r, max_results=%d, include_dirs=%s",
+        pattern,
+        root_path,
+        max_results,
+        include_dirs,
     )
 
-    # Log system information
-    logger.debug(f"[FUZZY_SEARCH] System: {sys.platform}, Python: {sys.version}")
-    logger.debug(f"[FUZZY_SEARCH] Working directory: {os.getcwd()}")
+    key = (pattern, root_path or "", max_results, include_dirs, prune)
+    now = time.monotonic()
+    with _fuzzy_cache_lock:
+        cached = _fuzzy_cache.get(key)
+        if cached is not None and now - cached[0] < FUZZY_CACHE_TTL:
+            _fuzzy_cache.move_to_end(key)
+            logger.debug("[FUZZY_SEARCH] Returning %d cached results", len(cached[1]))
+            return list(cached[1])
 
     try:
-        from .search.fzf import FzfSearch
-
-        logger.debug(f"[FUZZY_SEARCH] Successfully imported FzfSearch")
-
-        search_instance = FzfSearch()
+        search_instance = _fuzzy_searcher()
         logger.debug(
-            f"[FUZZY_SEARCH] Created FzfSearch instance, fzf_available={search_instance.fd_available}"
+            "[FUZZY_SEARCH] Using shared FzfSearch instance, fzf_available=%s",
+            search_instance.fd_available,
         )
 
-        results = search_instance.search(pattern, root_path, max_results, include_dirs)
-        logger.debug(f"[FUZZY_SEARCH] Search completed, found {len(results)} results")
+        results = search_instance.search(
+            pattern, root_path, max_results, include_dirs, prune
+        )
+        logger.debug("[FUZZY_SEARCH] Search completed, found %d results", len(results))
 
         # Log the results (but limit the output if there are many results)
-        if results:
-            result_preview = results[: min(3, len(results))]
-            logger.debug(f"[FUZZY_SEARCH] First few results: {result_preview}")
-            if len(results) > 3:
-                logger.debug(f"[FUZZY_SEARCH] ... and {len(results) - 3} more results")
-        else:
-            logger.debug("[FUZZY_SEARCH] No results found")
+        if logger.isEnabledFor(logging.DEBUG):
+            if results:
+                logger.debug("[FUZZY_SEARCH] First few results: %s", results[:3])
+                if len(results) > 3:
+                    logger.debug(
+                        "[FUZZY_SEARCH] ... and %d more results", len(results) - 3
+                    )
+            else:
+                logger.debug("[FUZZY_SEARCH] No results found")
+
+        with _fuzzy_cache_lock:
+            _fuzzy_cache[key] = (now, tuple(results))
+            _fuzzy_cache.move_to_end(key)
+            while len(_fuzzy_cache) > FUZZY_CACHE_SIZE:
+                _fuzzy_cache.popitem(last=False)
 
         return results
     except Exception as e:
-        logger.error(f"[FUZZY_SEARCH] Error in fuzzy_file_search: {str(e)}")
-        logger.error(f"[FUZZY_SEARCH] Traceback: {traceback.format_exc()}")
+        logger.exception("[FUZZY_SEARCH] Error in fuzzy_file_search: %s", e)
         raise
 
 
-def search_content(path: str, pattern: str) -> str:
-    from .search.ripgrep import RipgrepSearch
-
-    result = RipgrepSearch().search(pattern, path)
+async def search_content(path: str, pattern: str) -> str:
+    try:
+        st = os.stat(path)
+        key = (pattern, path, st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = None  # Let the search report the error; don't cache it
+
+    now = time.monotonic()
+    if key is not None:
+        with _content_cache_lock:
+            cached = _content_cache.get(key)
+            if cached is not None and now - cached[0] < CONTENT_CACHE_TTL:
+                _content_cache.move_to_end(key)
+                return cached[1]
+
+    async with _search_slots:
+        result = await _RIPGREP.search_text_async(pattern, path)
     if result.error:
         return result.error
-    return "\n".join(
-        f"{m.path}:{m.line_number}:{m.line_content}" for m in result.matches
-    )
 
+    if key is not None:
+        with _content_cache_lock:
+            _content_cache[key] = (now, result.text)
+            _content_cache.move_to_end(key)
+            while len(_content_cache) > CONTENT_CACHE_SIZE:
+                _content_cache.popitem(last=False)
+    return result.text
 
-def read_file(path: str) -> str:
-    from .file.reader import FileReader
 
-    return FileReader().read_file(path)
+def read_file(path: str) -> str:
+    return _READER.read_file(path)
 
 
 def write_file(path: str, content: str) -> str:
-    from .file.writer import FileWriter
-
-    result = FileWriter().replace_string(path, "", content)
+    result = _WRITER.write_file(path, content)
+    _clear_fuzzy_cache()
+    _clear_content_cache()
     return (
         "Success"
         if result.success
@@ -142,12 +236,14 @@ def write_file(path: str, content: str) -> str:
 
 
 def edit_file(path: str, edits: List[dict]) -> str:
-    from .file.writer import FileWriter, LineEdit
-
+    if not edits:
+        return "No changes made"
     line_edits = [
         LineEdit(e["line_start"], e["line_end"], e["new_content"]) for e in edits
     ]
-    result = FileWriter().apply_line_edits(path, line_edits)
+    result = _WRITER.apply_line_edits(path, line_edits)
+    _clear_fuzzy_cache()
+    _clear_content_cache()
     return (
         f"Edited {result.changed_lines} lines"
         if result.success
@@ -155,166 +251,271 @@ def edit_file(path: str, edits: List[dict]) -> str:
     )
 
 
-async def serve() -> None:
-    logger.info("[SERVER] Starting SpiderFsMcp server")
-    server = Server("mcp-filesystem")
-    logger.debug("[SERVER] Server instance created")
-
-    @server.list_tools()
-    async def list_tools() -> List[Tool]:
-        return [
-            Tool(
-                name=FileTools.SEARCH,
-                description="Search file contents using ripgrep",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "path": {"type": "string"},
-                        "pattern": {"type": "string"},
-                    },
-                    "required": ["path", "pattern"],
-                },
-            ),
-            Tool(
-                name=FileTools.FUZZY_SEARCH,
-                description="Fuzzy search for files and directories using fzf",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "pattern": {"type": "string"},
-                        "root_path": {"type": "string", "default": None},
-                        "max_results": {"type": "integer", "default": 5},
-                        "include_dirs": {"type": "boolean", "default": True},
-                    },
-                    "required": ["pattern"],
-                },
-            ),
-            Tool(
-                name=FileTools.READ,
-                description="Read file contents",
-                inputSchema={
-                    "type": "object",
-                    "properties": {"path": {"type": "string"}},
-                    "required": ["path"],
-                },
-            ),
-            Tool(
-                name=FileTools.WRITE,
-                description="Write file contents",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "path": {"type": "string"},
-                        "content": {"type": "string"},
-                    },
-                    "required": ["path", "content"],
-                },
-            ),
-            Tool(
-                name=FileTools.EDIT,
-                description="Edit file lines",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "path": {"type": "string"},
-                        "edits": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "line_start": {"type": "integer"},
-                                    "line_end": {"type": "integer"},
-                                    "new_content": {"type": "string"},
-                                },
-                                "required": ["line_start", "line_end", "new_content"],
-                            },
+# The tool list is static, so it is built once rather than per list_tools
+# request
+_TOOLS: List[Tool] = [
+    Tool(
+        name=FileTools.SEARCH,
+        description="Search file contents using ripgrep",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {"type": "string"},
+                "pattern": {"type": "string"},
+            },
+            "required": ["path", "pattern"],
+        },
+    ),
+    Tool(
+        name=FileTools.FUZZY_SEARCH,
+        description="Fuzzy search for files and directories using fzf",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pattern": {"type": "string"},
+                "root_path": {"type": "string", "default": None},
+                "max_results": {"type": "integer", "default": 5},
+                "include_dirs": {"type": "boolean", "default": True},
+                "prune": {"type": "boolean", "default": False},
+            },
+            "required": ["pattern"],
+        },
+    ),
+    Tool(
+        name=FileTools.READ,
+        description="Read file contents",
+        inputSchema={
+            "type": "object",
+            "properties": {"path": {"type": "string"}},
+            "required": ["path"],
+        },
+    ),
+    Tool(
+        name=FileTools.WRITE,
+        description="Write file contents",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {"type": "string"},
+                "content": {"type": "string"},
+            },
+            "required": ["path", "content"],
+        },
+    ),
+    Tool(
+        name=FileTools.EDIT,
+        description="Edit file lines",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {"type": "string"},
+                "edits": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "line_start": {"type": "integer"},
+                            "line_end": {"type": "integer"},
+                            "new_content": {"type": "string"},
                         },
+                        "required": ["line_start", "line_end", "new_content"],
                     },
-                    "required": ["path", "edits"],
                 },
-            ),
-        ]
+            },
+            "required": ["path", "edits"],
+        },
+    ),
+]
+
+# Tool name -> (required argument names, defaults for the optional ones),
+# taken from the input schemas above so call_tool can check and fill in
+# arguments before dispatching
+_TOOL_ARGUMENTS: Dict[str, Tuple[Tuple[str, ...], Dict[str, Any]]] = {
+    FileTools(tool.name).value: (
+        tuple(tool.inputSchema.get("required", ())),
+        {
+            key: prop["default"]
+            for key, prop in tool.inputSchema["properties"].items()
+            if "default" in prop
+        },
+    )
+    for tool in _TOOLS
+}
 
-    @server.call_tool()
-    async def call_tool(name: str, arguments: dict) -> List[TextContent]:
-        logger.debug(f"[CALL_TOOL] Tool called: {name}, arguments: {arguments}")
-        try:
-            match FileTools(name):
-                case FileTools.SEARCH:
-                    logger.debug(
-                        f"[CALL_TOOL] Executing content search with path='{arguments['path']}', pattern='{arguments['pattern']}'"
-                    )
-                    result = search_content(arguments["path"], arguments["pattern"])
-                    logger.debug(
-                        f"[CALL_TOOL] Content search completed, result length: {len(result)}"
-                    )
-                    return [TextContent(type="text", text=result)]
-                case FileTools.FUZZY_SEARCH:
-                    pattern = arguments["pattern"]
-                    root_path = arguments.get("root_path")
-                    max_results = arguments.get("max_results", 5)
-                    include_dirs = arguments.get("include_dirs", True)
 
-                    logger.debug(
-                        f"[CALL_TOOL] Executing fuzzy file search with pattern='{pattern}', root_path='{root_path}', max_results={max_results}, include_dirs={include_dirs}"
-                    )
+def _bind_arguments(
+    name: str, arguments: dict
+) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    Check a tool call's arguments against its schema's required keys and
+    fill in the schema defaults
 
-                    results = fuzzy_file_search(
-                        pattern,
-                        root_path,
-                        max_results,
-                        include_dirs,
-                    )
+    Returns:
+        (arguments, None) on success, (None, error message) if required
+        arguments are missing
+    """
+    required, defaults = _TOOL_ARGUMENTS[name]
+    missing = [key for key in required if key not in arguments]
+    if missing:
+        return None, f"Missing required argument(s): {', '.join(missing)}"
+    return {**defaults, **arguments}, None
+
+
+# call_tool handlers, one per tool. Arguments arrive with every required
+# key present and the schema defaults filled in. File operations and the
+# fuzzy search walk are blocking; they run in the default executor so
+# they do not stall the stdio event loop.
+async def _call_search_content(arguments: dict) -> str:
+    logger.debug(
+        "[CALL_TOOL] Executing content search with path=%r, pattern=%r",
+        arguments["path"],
+        arguments["pattern"],
+    )
+    result = await search_content(arguments["path"], arguments["pattern"])
+    logger.debug("[CALL_TOOL] Content search completed, result length: %d", len(result))
+    return result
 
-                    logger.debug(
-                        f"[CALL_TOOL] Fuzzy search completed, found {len(results)} results"
-                    )
-                    result_text = "\n".join(results)
-                    logger.debug(
-                        f"[CALL_TOOL] Returning results with length {len(result_text)}"
-                    )
 
-                    return [TextContent(type="text", text=result_text)]
+async def _call_fuzzy_file_search(arguments: dict) -> str:
+    pattern = arguments["pattern"]
+    root_path = arguments["root_path"]
+    max_results = arguments["max_results"]
+    include_dirs = arguments["include_dirs"]
+    prune = arguments["prune"]
 
-                case FileTools.READ:
-                    logger.debug(f"[CALL_TOOL] Reading file: {arguments['path']}")
-                    result = read_file(arguments["path"])
-                    logger.debug(
-                        f"[CALL_TOOL] File read completed, content length: {len(result)}"
-                    )
-                    return [TextContent(type="text", text=result)]
+    logger.debug(
+        "[CALL_TOOL] Executing fuzzy file search with pattern=%r, root_path=%r, max_results=%d, include_dirs=%s",
+        pattern,
+        root_path,
+        max_results,
+        include_dirs,
+    )
 
-                case FileTools.WRITE:
-                    logger.debug(
-                        f"[CALL_TOOL] Writing to file: {arguments['path']}, content length: {len(arguments['content'])}"
-                    )
-                    result = write_file(arguments["path"], arguments["content"])
-                    logger.debug(f"[CALL_TOOL] File write completed, result: {result}")
-                    return [TextContent(type="text", text=result)]
+    results = await asyncio.get_running_loop().run_in_executor(
+        None,
+        fuzzy_file_search,
+        pattern,
+        root_path,
+        max_results,
+        include_dirs,
+        prune,
+    )
+
+    logger.debug("[CALL_TOOL] Fuzzy search completed, found %d results", len(results))
+    return "\n".join(results)
+
+
+async def _call_read_file(arguments: dict) -> str:
+    logger.debug("[CALL_TOOL] Reading file: %s", arguments["path"])
+    result = await asyncio.get_running_loop().run_in_executor(
+        None, read_file, arguments["path"]
+    )
+    logger.debug("[CALL_TOOL] File read completed, content length: %d", len(result))
+    return result
+
+
+async def _call_write_file(arguments: dict) -> str:
+    logger.debug(
+        "[CALL_TOOL] Writing to file: %s, content length: %d",
+        arguments["path"],
+        len(arguments["content"]),
+    )
+    result = await asyncio.get_running_loop().run_in_executor(
+        None, write_file, arguments["path"], arguments["content"]
+    )
+    logger.debug("[CALL_TOOL] File write completed, result: %s", result)
+    return result
 
-                case FileTools.EDIT:
-                    logger.debug(
-                        f"[CALL_TOOL] Editing file: {arguments['path']}, with {len(arguments['edits'])} edits"
-                    )
-                    result = edit_file(arguments["path"], arguments["edits"])
-                    logger.debug(f"[CALL_TOOL] File edit completed, result: {result}")
-                    return [TextContent(type="text", text=result)]
 
-                case _:
-                    logger.error(f"[CALL_TOOL] Unknown tool: {name}")
-                    raise ValueError(f"Unknown tool: {name}")
+async def _call_edit_file(arguments: dict) -> str:
+    logger.debug(
+        "[CALL_TOOL] Editing file: %s, with %d edits",
+        arguments["path"],
+        len(arguments["edits"]),
+    )
+    result = await asyncio.get_running_loop().run_in_executor(
+        None, edit_file, arguments["path"], arguments["edits"]
+    )
+    logger.debug("[CALL_TOOL] File edit completed, result: %s", result)
+    return result
+
+
+# Tool name -> handler, so a call is one dict lookup instead of an enum
+# conversion and a match over every case
+_TOOL_HANDLERS: Dict[str, Callable[[dict], Awaitable[str]]] = {
+    FileTools.SEARCH.value: _call_search_content,
+    FileTools.FUZZY_SEARCH.value: _call_fuzzy_file_search,
+    FileTools.READ.value: _call_read_file,
+    FileTools.WRITE.value: _call_write_file,
+    FileTools.EDIT.value: _call_edit_file,
+}
+
+
+def _configure_debug_logging() -> None:
+    """
+    Log everything at DEBUG to stderr and spiderfs_debug.log
+
+    Only done when SPIDERFS_DEBUG is set; otherwise logging is left to
+    whoever runs the server (the CLI logs INFO to stderr), so importing
+    this module never touches the root logger or creates files.
+    """
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(message)s",
+        handlers=[logging.FileHandler("spiderfs_debug.log"), logging.StreamHandler()],
+        force=True,
+    )
+
+
+async def serve() -> None:
+    if os.environ.get("SPIDERFS_DEBUG"):
+        _configure_debug_logging()
+
+    # mcp already handles each request in its own task; size the default
+    # executor so concurrent blocking tool calls don't queue behind each
+    # other. Tool calls wait on work they fan out to the shared I/O pool,
+    # so they need threads of their own.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(
+            max_workers=IO_MAX_WORKERS, thread_name_prefix="spiderfs-tool"
+        )
+    )
+    logger.info("[SERVER] Starting SpiderFsMcp server")
+    # Static for the life of the process, so logged once here rather than
+    # on every search
+    logger.debug("[SERVER] System: %s, Python: %s", sys.platform, sys.version)
+    logger.debug("[SERVER] Working directory: %s", os.getcwd())
+    server = Server("mcp-filesystem")
+    logger.debug("[SERVER] Server instance created")
+
+    @server.list_tools()
+    async def list_tools() -> List[Tool]:
+        return _TOOLS
+
+    @server.call_tool()
+    async def call_tool(name: str, arguments: dict) -> List[TextContent]:
+        logger.debug("[CALL_TOOL] Tool called: %s, arguments: %s", name, arguments)
+        try:
+            handler = _TOOL_HANDLERS.get(name)
+            if handler is None:
+                logger.error("[CALL_TOOL] Unknown tool: %s", name)
+                raise ValueError(f"Unknown tool: {name}")
+
+            arguments, error = _bind_arguments(name, arguments)
+            if error:
+                # Bad input, not a server fault: answer without a traceback
+                logger.warning("[CALL_TOOL] %s: %s", name, error)
+                return [TextContent(type="text", text=f"Error: {error}")]
+            return [TextContent(type="text", text=await handler(arguments))]
 
         except Exception as e:
             error_msg = f"Error: {str(e)}"
-            tb = traceback.format_exc()
-            logger.error(
-                f"[CALL_TOOL] Exception during tool execution: {error_msg}\n{tb}"
-            )
+            logger.exception("[CALL_TOOL] Tool %s failed: %s", name, error_msg)
             return [TextContent(type="text", text=error_msg)]
 
     logger.debug("[SERVER] Creating initialization options")
     options = server.create_initialization_options()
-    logger.debug(f"[SERVER] Initialization options created: {options}")
+    logger.debug("[SERVER] Initialization options created: %s", options)
 
     logger.info("[SERVER] Starting stdio server")
     try:
@@ -323,12 +524,9 @@ async def serve() -> None:
             await server.run(read_stream, write_stream, options, raise_exceptions=True)
             logger.info("[SERVER] Server run completed")
     except Exception as e:
-        logger.error(f"[SERVER] Fatal error in server: {str(e)}")
-        logger.error(f"[SERVER] Traceback: {traceback.format_exc()}")
+        logger.exception("[SERVER] Fatal error in server: %s", e)
         raise
 
 
 if __name__ == "__main__":
-    import asyncio
-
     asyncio.run(serve())
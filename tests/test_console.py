@@ -0,0 +1,115 @@
+import io
+import json
+import os
+import sys
+
+import pytest
+
+from spiderfs_mcp.console import main as main_module
+from spiderfs_mcp.console.main import MCPAdapter, _encode_response, _read_request_batches
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs bytes file names")
+def test_encode_response_non_utf8_name(tmp_path):
+    (tmp_path / os.fsdecode(b"caf\xe9.txt")).write_text("x")
+    result = MCPAdapter(str(tmp_path)).list_directory({"path": ""})
+
+    line = _encode_response({"id": "1", "result": result})
+
+    assert line.endswith(b"\n")
+    assert json.loads(line)["result"]["entries"] == ["[FILE] " + os.fsdecode(b"caf\xe9.txt")]
+
+
+@pytest.fixture
+def adapter(tmp_path):
+    return MCPAdapter(str(tmp_path))
+
+
+def test_read_multiple_files(adapter, tmp_path):
+    (tmp_path / "a.txt").write_text("alpha\n")
+    (tmp_path / "b.txt").write_text("beta\n")
+
+    results = adapter.read_multiple_files({"paths": ["b.txt", "missing.txt", "a.txt"]})
+
+    assert list(results) == ["b.txt", "missing.txt", "a.txt"]
+    assert results["a.txt"] == {"content": "alpha\n"}
+    assert results["b.txt"] == {"content": "beta\n"}
+    assert "File not found" in results["missing.txt"]["error"]
+
+
+def test_directory_tree_order(adapter, tmp_path):
+    (tmp_path / "Zdir" / "inner").mkdir(parents=True)
+    (tmp_path / "Zdir" / "inner" / "deep.txt").write_text("")
+    (tmp_path / "adir").mkdir()
+    (tmp_path / "b.txt").write_text("")
+    (tmp_path / "A.txt").write_text("")
+    (tmp_path / ".hidden").write_text("")
+
+    tree = adapter.directory_tree({"path": ""})["tree"]
+
+    # Files before directories, each group sorted case-insensitively
+    assert [child["name"] for child in tree["children"]] == ["A.txt", "b.txt", "adir", "Zdir"]
+    zdir = tree["children"][3]
+    assert zdir["children"] == [
+        {"name": "inner", "type": "directory", "children": [{"name": "deep.txt", "type": "file"}]}
+    ]
+
+
+def test_search_files_by_name_excludes(adapter, tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "gen.py").write_text("")
+    (tmp_path / "setup.py").write_text("")
+    (tmp_path / "notes.txt").write_text("")
+
+    result = adapter._search_files_by_name(str(tmp_path), "*.py", ["build", "setup.*"])
+
+    assert result == {"matches": [str(tmp_path / "src" / "main.py")]}
+
+
+def test_read_request_batches():
+    read_fd, write_fd = os.pipe()
+    try:
+        os.write(write_fd, b'{"a": 1}\n{"b": 2}\n{"c": 3}')
+        os.close(write_fd)
+
+        # The unterminated final line is still yielded at EOF
+        assert list(_read_request_batches(read_fd)) == [
+            [b'{"a": 1}', b'{"b": 2}'],
+            [b'{"c": 3}'],
+        ]
+    finally:
+        os.close(read_fd)
+
+
+def test_main_loop(tmp_path, monkeypatch):
+    (tmp_path / "a.txt").write_text("alpha\n")
+    read_fd, write_fd = os.pipe()
+    os.write(
+        write_fd,
+        b'{"id": "1", "function": "read_multiple_files", "params": {"paths": ["a.txt"]}}\n'
+        b"not json\n"
+        b'{"id": "2", "function": "nope"}\n'
+        b'{"id": "3", "function": "list_allowed_directories"}\n'
+        b'{"id": "4", "function": "get_file_info", "params": {"path": "a.txt"}}',
+    )
+    os.close(write_fd)
+
+    # A result that cannot be serialized fails only its own request
+    monkeypatch.setattr(MCPAdapter, "list_allowed_directories", lambda self, params: {"bad": object()})
+    stdout = io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr(sys, "argv", ["spiderfs", str(tmp_path)])
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(os.fdopen(read_fd, "rb")))
+    monkeypatch.setattr(sys, "stdout", stdout)
+
+    main_module.main()
+
+    sys.stdin.close()
+    responses = [json.loads(line) for line in stdout.buffer.getvalue().splitlines()]
+    assert responses[0] == {"id": "1", "result": {"a.txt": {"content": "alpha\n"}}}
+    assert responses[1] == {"id": "", "result": {"error": "Invalid JSON request"}}
+    assert responses[2] == {"id": "2", "result": {"error": "Unknown function: nope"}}
+    assert responses[3]["result"]["error"].startswith("Error processing request")
+    assert responses[4]["id"] == "4" and responses[4]["result"]["info"]["size"] == 6
+    assert len(responses) == 5
@@ -1,3 +1,4 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
 from pathlib import Path
@@ -145,7 +146,7 @@ def test_stream_file_by_lines(mock_path_exists, mock_path_is_file):
         assert response.headers["content-type"] == "application/x-ndjson"
 
         # Parse the NDJSON response (each line is a JSON object)
-        chunks = [eval(line) for line in response.content.decode().strip().split("\n")]
+        chunks = [json.loads(line) for line in response.content.decode().strip().split("\n")]
         assert len(chunks) == 2
         assert chunks[0]["chunk"] == "line 1\nline 2\n"
         assert chunks[0]["metadata"]["chunk_number"] == 1
@@ -37,6 +37,21 @@ class TestFileReader:
         assert result.replace("\r\n", "\n") == content
         os.unlink(file_path)
 
+    def test_read_file_normalizes_newlines(self, reader):
+        file_path = create_test_file("a\r\nb\rc\n")
+        assert reader.read_file(file_path) == "a\nb\nc\n"
+        os.unlink(file_path)
+
+    def test_read_file_large_file_is_mapped(self, reader, monkeypatch):
+        monkeypatch.setattr("spiderfs_mcp.file.reader.READ_MMAP_THRESHOLD", 8)
+        file_path = create_test_file("héllo\r\nwörld\n")
+        assert reader.read_file(file_path) == "héllo\nwörld\n"
+        os.unlink(file_path)
+
+        file_path = create_test_file("")
+        assert reader.read_file(file_path) == ""
+        os.unlink(file_path)
+
     def test_read_file_line_range(self, reader):
         content = "Line 1\nLine 2\nLine 3\nLine 4\n"
         file_path = create_test_file(content)
@@ -44,6 +59,24 @@ class TestFileReader:
         assert lines.content == "Line 2\nLine 3\n"
         os.unlink(file_path)
 
+    def test_read_line_range_sees_same_size_rewrite(self, reader, tmp_path):
+        path = tmp_path / "t.txt"
+        path.write_bytes(b"aa\nbb\ncc\n")
+        assert reader.read_line_range(str(path), LineRange(2, 2)).content == "bb\n"
+
+        # Same size, mtime restored: only ctime shows the change
+        st = os.stat(path)
+        path.write_bytes(b"a\nabb\ncc\n")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert reader.read_line_range(str(path), LineRange(2, 2)).content == "abb\n"
+
+    def test_read_line_range_lone_cr(self, reader, tmp_path):
+        # A lone \r ends a line, as in text mode
+        path = tmp_path / "cr.txt"
+        path.write_bytes(b"a\rb\r\nc\n")
+        assert reader.read_line_range(str(path), LineRange(2, 2)).content == "b\n"
+        assert reader.read_line_range(str(path), LineRange(1, 3)).content == "a\nb\nc\n"
+
     def test_read_file_invalid_encoding(self, reader):
         content = "Hello, 世界!"
         file_path = create_test_file(content, "utf-8")
@@ -51,6 +84,70 @@ class TestFileReader:
             reader.read_file(file_path, "ascii")
         os.unlink(file_path)
 
+    def test_read_line_range_late_and_crlf(self, reader):
+        content = "".join(f"Line {i}\r\n" for i in range(1, 1001)) + "Last"
+        file_path = create_test_file(content)
+        result = reader.read_line_range(file_path, LineRange(999, 1005))
+        assert result.content == "Line 999\nLine 1000\nLast"
+        assert result.metadata["total_lines"] == 1001
+        os.unlink(file_path)
+
+    def test_read_line_range_after_modification(self, reader):
+        file_path = create_test_file("Line 1\nLine 2\n")
+        assert reader.read_line_range(file_path, LineRange(2, 2)).content == "Line 2\n"
+
+        # The cached line index must not outlive the file contents
+        with open(file_path, "w") as f:
+            f.write("First line here\nSecond line here\nThird\n")
+        result = reader.read_line_range(file_path, LineRange(2, 3))
+        assert result.content == "Second line here\nThird\n"
+        os.unlink(file_path)
+
+    def test_read_line_range_utf16(self, reader):
+        content = "Line 1\nLine \u010a\nLine 3\n"
+        file_path = create_test_file(content, "utf-16")
+        result = reader.read_line_range(file_path, LineRange(2, 3), "utf-16")
+        assert result.content == "Line \u010a\nLine 3\n"
+        os.unlink(file_path)
+
+    def test_read_context_around_line(self, reader):
+        content = "".join(f"Line {i}\n" for i in range(1, 11))
+        file_path = create_test_file(content)
+        result = reader.read_context_around_line(file_path, 2, context_lines=2)
+        assert result.content == "Line 1\nLine 2\nLine 3\nLine 4\n"
+        assert result.line_range == LineRange(1, 4)
+        assert result.metadata["target_line"] == 2
+        assert result.metadata["total_lines"] == 4
+
+        result = reader.read_context_around_line(file_path, 10, context_lines=3)
+        assert result.content == "Line 7\nLine 8\nLine 9\nLine 10\n"
+        os.unlink(file_path)
+
+        result = reader.read_context_around_line(file_path, 1)
+        assert result.error == f"File not found: {file_path}"
+        assert result.metadata["context_lines"] == 3
+
+    def test_read_line_range_utf8_sig(self, reader):
+        content = "Line 1\nLine 2\nLine 3\n"
+        file_path = create_test_file(content, "utf-8-sig")
+        result = reader.read_line_range(file_path, LineRange(1, 2), "utf-8-sig")
+        assert result.content == "Line 1\nLine 2\n"
+        result = reader.read_line_range(file_path, LineRange(3, 3), "utf-8-sig")
+        assert result.content == "Line 3\n"
+        os.unlink(file_path)
+
+    def test_read_many(self, reader):
+        paths = [create_test_file(f"File {i}\nSecond {i}\n") for i in range(5)]
+        requests = [(path, LineRange(2, 2)) for path in paths]
+        requests.append(("missing.txt", LineRange(1, 1)))
+
+        results = reader.read_many(requests)
+
+        assert [r.content for r in results[:5]] == [f"Second {i}\n" for i in range(5)]
+        assert results[5].error == "File not found: missing.txt"
+        for path in paths:
+            os.unlink(path)
+
     def test_read_file_invalid_line_range(self, reader):
         content = "Line 1\nLine 2\n"
         file_path = create_test_file(content)
@@ -73,6 +170,16 @@ class TestFileReader:
         assert reader.detect_encoding(file_path) == "latin1"
         os.unlink(file_path)
 
+    def test_detect_encoding_bom_and_sample_boundary(self, reader):
+        file_path = create_test_file("\ufeffHello", "utf-16")
+        assert reader.detect_encoding(file_path) == "utf-16"
+        os.unlink(file_path)
+
+        # The sample ends in the middle of a multibyte character
+        file_path = create_test_file("a" + "世" * 10)
+        assert reader.detect_encoding(file_path, sample_size=3) == "utf-8"
+        os.unlink(file_path)
+
     def test_read_file_error_handling(self, reader):
         # Test with problematic content but proper handling
         content = "Normal text\nProblematic: \ud800\nMore text"
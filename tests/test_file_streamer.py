@@ -1,157 +1,309 @@
+import io
+import os
 import pytest
-from unittest.mock import patch, mock_open
-from pathlib import Path
+from unittest.mock import patch
 from spiderfs_mcp.file.streamer import FileStreamer
 
 
-def test_stream_file_by_lines():
-    mock_file_content = "line 1\nline 2\nline 3\nline 4\nline 5\n"
-    
-    with patch("builtins.open", mock_open(read_data=mock_file_content)):
-        with patch.object(Path, "exists") as mock_exists:
-            with patch.object(Path, "is_file") as mock_is_file:
-                with patch("os.path.getsize") as mock_getsize:
-                    mock_exists.return_value = True
-                    mock_is_file.return_value = True
-                    mock_getsize.return_value = len(mock_file_content)
-                    
-                    streamer = FileStreamer(chunk_size=2)  # 2 lines per chunk
-                    chunks = list(streamer.stream_file_by_lines("test.txt"))
-                    
-                    # Should have 3 chunks: 2 lines, 2 lines, 1 line
-                    assert len(chunks) == 3
-                    
-                    # First chunk should have lines 1-2
-                    content, metadata = chunks[0]
-                    assert content == "line 1\nline 2\n"
-                    assert metadata["chunk_number"] == 1
-                    assert metadata["lines_in_chunk"] == 2
-                    
-                    # Second chunk should have lines 3-4
-                    content, metadata = chunks[1]
-                    assert content == "line 3\nline 4\n"
-                    assert metadata["chunk_number"] == 2
-                    assert metadata["lines_in_chunk"] == 2
-                    
-                    # Third chunk should have line 5
-                    content, metadata = chunks[2]
-                    assert content == "line 5\n"
-                    assert metadata["chunk_number"] == 3
-                    assert metadata["lines_in_chunk"] == 1
-
-
-def test_stream_file_by_lines_file_not_found():
-    with patch.object(Path, "exists") as mock_exists:
-        mock_exists.return_value = False
-        
+def test_stream_file_by_lines(tmp_path):
+    file_path = tmp_path / "t.txt"
+    file_path.write_bytes(b"line 1\nline 2\nline 3\nline 4\nline 5\n")
+    
+    streamer = FileStreamer(chunk_size=2)  # 2 lines per chunk
+    chunks = list(streamer.stream_file_by_lines(str(file_path)))
+    
+    # Should have 3 chunks: 2 lines, 2 lines, 1 line
+    assert len(chunks) == 3
+    
+    # First chunk should have lines 1-2
+    content, metadata = chunks[0]
+    assert content == "line 1\nline 2\n"
+    assert metadata["chunk_number"] == 1
+    assert metadata["lines_in_chunk"] == 2
+    
+    # Second chunk should have lines 3-4
+    content, metadata = chunks[1]
+    assert content == "line 3\nline 4\n"
+    assert metadata["chunk_number"] == 2
+    assert metadata["lines_in_chunk"] == 2
+    
+    # Third chunk should have line 5
+    content, metadata = chunks[2]
+    assert content == "line 5\n"
+    assert metadata["chunk_number"] == 3
+    assert metadata["lines_in_chunk"] == 1
+
+
+def test_stream_file_by_lines_file_not_found(tmp_path):
+    streamer = FileStreamer()
+    chunks = list(streamer.stream_file_by_lines(str(tmp_path / "nonexistent.txt")))
+    
+    # Should have one error chunk
+    assert len(chunks) == 1
+    content, metadata = chunks[0]
+    assert content == ""
+    assert "error" in metadata
+    assert "File not found" in metadata["error"]
+
+
+def test_stream_file_by_lines_not_a_file(tmp_path):
+    streamer = FileStreamer()
+    chunks = list(streamer.stream_file_by_lines(str(tmp_path)))
+    
+    # Should have one error chunk
+    assert len(chunks) == 1
+    content, metadata = chunks[0]
+    assert content == ""
+    assert "error" in metadata
+    assert "not a regular file" in metadata["error"]
+
+
+def test_stream_file_by_lines_read_error(tmp_path):
+    file_path = tmp_path / "t.txt"
+    file_path.write_bytes(b"line 1\n")
+    
+    with patch("builtins.open", side_effect=Exception("Mock I/O error")):
         streamer = FileStreamer()
-        chunks = list(streamer.stream_file_by_lines("nonexistent.txt"))
-        
-        # Should have one error chunk
-        assert len(chunks) == 1
-        content, metadata = chunks[0]
-        assert content == ""
-        assert "error" in metadata
-        assert "File not found" in metadata["error"]
-
-
-def test_stream_file_by_lines_not_a_file():
-    with patch.object(Path, "exists") as mock_exists:
-        with patch.object(Path, "is_file") as mock_is_file:
-            mock_exists.return_value = True
-            mock_is_file.return_value = False
-            
-            streamer = FileStreamer()
-            chunks = list(streamer.stream_file_by_lines("directory"))
-            
-            # Should have one error chunk
-            assert len(chunks) == 1
-            content, metadata = chunks[0]
-            assert content == ""
-            assert "error" in metadata
-            assert "not a regular file" in metadata["error"]
-
-
-def test_stream_file_by_lines_read_error():
-    with patch.object(Path, "exists") as mock_exists:
-        with patch.object(Path, "is_file") as mock_is_file:
-            with patch("builtins.open") as mock_open_func:
-                mock_exists.return_value = True
-                mock_is_file.return_value = True
-                mock_open_func.side_effect = Exception("Mock I/O error")
-                
-                streamer = FileStreamer()
-                chunks = list(streamer.stream_file_by_lines("test.txt"))
-                
-                # Should have one error chunk
-                assert len(chunks) == 1
-                content, metadata = chunks[0]
-                assert content == ""
-                assert "error" in metadata
-                assert "Error streaming file" in metadata["error"]
-
-
-def test_stream_file_by_bytes():
-    mock_file_content = b"0123456789" * 10  # 100 bytes
-    
-    with patch("builtins.open", mock_open(read_data=mock_file_content)):
-        with patch.object(Path, "exists") as mock_exists:
-            with patch.object(Path, "is_file") as mock_is_file:
-                with patch("os.path.getsize") as mock_getsize:
-                    mock_exists.return_value = True
-                    mock_is_file.return_value = True
-                    mock_getsize.return_value = len(mock_file_content)
-                    
-                    streamer = FileStreamer()
-                    chunks = list(streamer.stream_file_by_bytes("test.txt", byte_chunk_size=30))
-                    
-                    # Should have 4 chunks of 30 bytes, except the last one with only 10 bytes
-                    assert len(chunks) == 4
-                    
-                    # First chunk should be 30 bytes
-                    chunk, metadata = chunks[0]
-                    assert len(chunk) == 30
-                    assert metadata["chunk_number"] == 1
-                    assert metadata["bytes_in_chunk"] == 30
-                    assert metadata["is_last_chunk"] is False
-                    
-                    # Last chunk should be 10 bytes
-                    chunk, metadata = chunks[3]
-                    assert len(chunk) == 10
-                    assert metadata["chunk_number"] == 4
-                    assert metadata["bytes_in_chunk"] == 10
-                    assert metadata["is_last_chunk"] is True
-
-
-def test_stream_file_by_bytes_file_not_found():
-    with patch.object(Path, "exists") as mock_exists:
-        mock_exists.return_value = False
-        
+        chunks = list(streamer.stream_file_by_lines(str(file_path)))
+    
+    # Should have one error chunk
+    assert len(chunks) == 1
+    content, metadata = chunks[0]
+    assert content == ""
+    assert "error" in metadata
+    assert "Error streaming file" in metadata["error"]
+
+
+def test_stream_file_by_bytes(tmp_path):
+    file_path = tmp_path / "t.bin"
+    file_path.write_bytes(b"0123456789" * 10)  # 100 bytes
+    
+    streamer = FileStreamer()
+    chunks = list(streamer.stream_file_by_bytes(str(file_path), byte_chunk_size=30))
+    
+    # Should have 4 chunks of 30 bytes, except the last one with only 10 bytes
+    assert len(chunks) == 4
+    
+    # First chunk should be 30 bytes
+    chunk, metadata = chunks[0]
+    assert len(chunk) == 30
+    assert metadata["chunk_number"] == 1
+    assert metadata["bytes_in_chunk"] == 30
+    assert metadata["is_last_chunk"] is False
+    
+    # Last chunk should be 10 bytes
+    chunk, metadata = chunks[3]
+    assert len(chunk) == 10
+    assert metadata["chunk_number"] == 4
+    assert metadata["bytes_in_chunk"] == 10
+    assert metadata["is_last_chunk"] is True
+
+
+def test_stream_file_by_bytes_large_file_mmap(tmp_path):
+    from spiderfs_mcp.file.streamer import MMAP_THRESHOLD
+
+    file_content = os.urandom(MMAP_THRESHOLD + 100)
+    file_path = tmp_path / "large.bin"
+    file_path.write_bytes(file_content)
+
+    streamer = FileStreamer()
+    chunks = list(streamer.stream_file_by_bytes(str(file_path), byte_chunk_size=65536))
+
+    assert b"".join(chunk for chunk, _ in chunks) == file_content
+    assert len(chunks) == chunks[0][1]["estimated_total_chunks"]
+    assert chunks[-1][1]["bytes_in_chunk"] == (MMAP_THRESHOLD + 100) % 65536
+    assert chunks[-1][1]["is_last_chunk"] is True
+
+
+def test_stream_file_by_bytes_file_not_found(tmp_path):
+    streamer = FileStreamer()
+    chunks = list(streamer.stream_file_by_bytes(str(tmp_path / "nonexistent.txt")))
+    
+    # Should have one error chunk
+    assert len(chunks) == 1
+    chunk, metadata = chunks[0]
+    assert chunk == b""
+    assert "error" in metadata
+    assert "File not found" in metadata["error"]
+
+
+def test_stream_file_by_bytes_read_error(tmp_path):
+    file_path = tmp_path / "t.bin"
+    file_path.write_bytes(b"0123456789")
+    
+    with patch("builtins.open", side_effect=Exception("Mock I/O error")):
         streamer = FileStreamer()
-        chunks = list(streamer.stream_file_by_bytes("nonexistent.txt"))
+        chunks = list(streamer.stream_file_by_bytes(str(file_path)))
+    
+    # Should have one error chunk
+    assert len(chunks) == 1
+    chunk, metadata = chunks[0]
+    assert chunk == b""
+    assert "error" in metadata
+    assert "Error streaming file" in metadata["error"]
+
+
+def test_send_file(tmp_path):
+    source = tmp_path / "source.bin"
+    data = os.urandom(300 * 1024)
+    source.write_bytes(data)
+    target = tmp_path / "target.bin"
+    
+    streamer = FileStreamer()
+    with open(target, "wb") as out:
+        out.write(b"header")
+        result = streamer.send_file(str(source), out)
+    
+    assert "error" not in result
+    assert result["bytes_sent"] == len(data)
+    assert result["file_size"] == len(data)
+    assert target.read_bytes() == b"header" + data
+
+
+def test_send_file_without_fileno(tmp_path):
+    source = tmp_path / "source.txt"
+    source.write_bytes(b"raw bytes\n")
+    
+    out = io.BytesIO()
+    result = FileStreamer().send_file(str(source), out)
+    
+    assert result["bytes_sent"] == 10
+    assert out.getvalue() == b"raw bytes\n"
+
+
+def test_send_file_not_found(tmp_path):
+    result = FileStreamer().send_file(str(tmp_path / "missing"), io.BytesIO())
+    
+    assert "error" in result
+    assert "File not found" in result["error"]
+
+
+def test_stream_file_by_bytes_zero_copy(tmp_path):
+    data = os.urandom(2 * 1024 * 1024 + 123)
+    file_path = tmp_path / "large.bin"
+    file_path.write_bytes(data)
+    
+    streamer = FileStreamer()
+    received = bytearray()
+    for chunk, metadata in streamer.stream_file_by_bytes(str(file_path), zero_copy=True):
+        assert isinstance(chunk, memoryview)
+        received += chunk
+    
+    assert bytes(received) == data
+    assert metadata["is_last_chunk"] is True
+
+
+def test_stream_file_by_bytes_readinto_fallback(tmp_path):
+    data = os.urandom(2 * 1024 * 1024 + 123)
+    file_path = tmp_path / "large.bin"
+    file_path.write_bytes(data)
+    
+    streamer = FileStreamer()
+    with patch("mmap.mmap", side_effect=OSError("mmap not supported")):
+        for zero_copy in (False, True):
+            received = bytearray()
+            buffers = set()
+            for chunk, metadata in streamer.stream_file_by_bytes(str(file_path), zero_copy=zero_copy):
+                if zero_copy:
+                    buffers.add(id(chunk.obj))
+                received += chunk
+            
+            assert bytes(received) == data
+            assert metadata["is_last_chunk"] is True
+            if zero_copy:
+                # Every chunk was read into the same buffer
+                assert len(buffers) == 1
+
+
+def test_buffer_pool_keeps_only_default_size():
+    from spiderfs_mcp.file import streamer
+    
+    with patch.object(streamer, "_BUFFER_POOL", []):
+        streamer._release_buffer(bytearray(1000))
+        assert streamer._BUFFER_POOL == []
         
-        # Should have one error chunk
-        assert len(chunks) == 1
-        chunk, metadata = chunks[0]
-        assert chunk == b""
-        assert "error" in metadata
-        assert "File not found" in metadata["error"]
-
-
-def test_stream_file_by_bytes_read_error():
-    with patch.object(Path, "exists") as mock_exists:
-        with patch.object(Path, "is_file") as mock_is_file:
-            with patch("builtins.open") as mock_open_func:
-                mock_exists.return_value = True
-                mock_is_file.return_value = True
-                mock_open_func.side_effect = Exception("Mock I/O error")
-                
-                streamer = FileStreamer()
-                chunks = list(streamer.stream_file_by_bytes("test.txt"))
-                
-                # Should have one error chunk
-                assert len(chunks) == 1
-                chunk, metadata = chunks[0]
-                assert chunk == b""
-                assert "error" in metadata
-                assert "Error streaming file" in metadata["error"]
\ No newline at end of file
+        buf = streamer._acquire_buffer(streamer.DEFAULT_BYTE_CHUNK_SIZE)
+        streamer._release_buffer(buf)
+        assert streamer._acquire_buffer(streamer.DEFAULT_BYTE_CHUNK_SIZE) is buf
+
+def test_stream_file_by_bytes_raw_and_buffered_reads(tmp_path):
+    data = os.urandom(2 * 1024 * 1024 + 123)
+    file_path = tmp_path / "large.bin"
+    file_path.write_bytes(data)
+    
+    # Chunks below io.DEFAULT_BUFFER_SIZE keep the buffered reader,
+    # larger ones read through the raw file
+    streamer = FileStreamer()
+    with patch("mmap.mmap", side_effect=OSError("mmap not supported")):
+        for chunk_size in (io.DEFAULT_BUFFER_SIZE // 2, io.DEFAULT_BUFFER_SIZE * 4):
+            chunks = [chunk for chunk, _ in streamer.stream_file_by_bytes(str(file_path), byte_chunk_size=chunk_size)]
+            assert b"".join(chunks) == data
+            assert max(len(chunk) for chunk in chunks) == chunk_size
+
+
+def test_stream_file_by_lines_matches_text_mode(tmp_path):
+    # CRLF pairs, a lone CR and a missing final newline, with a block size
+    # small enough that line endings straddle block boundaries
+    path = tmp_path / "mixed.txt"
+    path.write_bytes("één\r\ntwee\rdrie\n".encode("utf-8") * 50 + b"last")
+    
+    with patch("spiderfs_mcp.file.streamer.LINE_READ_BLOCK_SIZE", 7):
+        streamer = FileStreamer(chunk_size=4)
+        chunks = list(streamer.stream_file_by_lines(str(path)))
+    
+    with open(path, "r", encoding="utf-8") as f:
+        expected = f.readlines()
+    
+    assert "".join(content for content, _ in chunks) == "".join(expected)
+    assert all(metadata["lines_in_chunk"] == 4 for _, metadata in chunks[:-1])
+    assert chunks[-1][0] == "".join(expected[-(len(expected) % 4 or 4):])
+    assert chunks[-1][1]["lines_read_so_far"] == len(expected)
+
+
+def test_stream_with_prefetch(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(100)))
+    streamer = FileStreamer(chunk_size=7)
+    
+    expected = list(streamer.stream_file_by_lines(str(path)))
+    assert list(streamer.stream_file_by_lines(str(path), prefetch=2)) == expected
+    
+    expected = list(streamer.stream_file_by_bytes(str(path), byte_chunk_size=64))
+    assert list(streamer.stream_file_by_bytes(str(path), byte_chunk_size=64, prefetch=2)) == expected
+    
+    # Abandoning the stream early must not leave the reader behind
+    chunks = streamer.stream_file_by_lines(str(path), prefetch=2)
+    next(chunks)
+    chunks.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="posix_fadvise not available")
+def test_stream_file_by_lines_advises_sequential_reads(tmp_path):
+    path = tmp_path / "large.txt"
+    path.write_text(("x" * 99 + "\n") * 20000)
+    
+    with patch("os.posix_fadvise") as mock_fadvise:
+        chunks = list(FileStreamer().stream_file_by_lines(str(path)))
+    
+    assert sum(metadata["lines_in_chunk"] for _, metadata in chunks) == 20000
+    assert mock_fadvise.call_args[0][1:] == (0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
+def test_chunk_metadata_reads_like_a_dict(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"0123456789")
+    
+    (_, metadata), = FileStreamer().stream_file_by_bytes(str(path), byte_chunk_size=16)
+    
+    assert metadata["bytes_in_chunk"] == metadata.bytes_in_chunk == 10
+    assert "is_last_chunk" in metadata
+    assert "error" not in metadata
+    assert metadata.get("error") is None
+    assert dict(metadata) == metadata._asdict() == {
+        "chunk_number": 1,
+        "estimated_total_chunks": 1,
+        "bytes_in_chunk": 10,
+        "file_size": 10,
+        "bytes_read_so_far": 10,
+        "is_last_chunk": True,
+    }
@@ -119,6 +119,9 @@ def test_apply_line_edits_invalid_range(temp_file):
     assert result.success is False
     assert "Invalid line range" in result.error
 
+    # Rejected edits leave no backup behind
+    assert not os.path.exists(f"{temp_file}.bak")
+
 
 def test_apply_line_edits_beyond_file_end(temp_file):
     writer = FileWriter()
@@ -131,6 +134,8 @@ def test_apply_line_edits_beyond_file_end(temp_file):
     
     assert result.success is False
     assert "beyond the end of file" in result.error
+    # Rejected without a backup being made
+    assert not os.path.exists(f"{temp_file}.bak")
 
 
 def test_apply_line_edits_no_changes(temp_file):
@@ -213,3 +218,240 @@ def test_replace_string_no_match(temp_file):
         content = f.read()
         
     assert content == "line 1\nline 2\nline 3\nline 4\nline 5\n"
+
+
+def test_write_file_existing(temp_file):
+    writer = FileWriter()
+    os.chmod(temp_file, 0o644)
+    
+    result = writer.write_file(temp_file, "new 1\nnew 2\n")
+    
+    assert result.success is True
+    assert result.changed_lines == 2
+    assert result.backup_path == f"{temp_file}.bak"
+    
+    # Verify file contents and that the mode survived the replace
+    with open(temp_file, 'r') as f:
+        assert f.read() == "new 1\nnew 2\n"
+    assert os.stat(temp_file).st_mode & 0o777 == 0o644
+    
+    # Verify the backup holds the original contents
+    with open(result.backup_path, 'r') as f:
+        assert f.read() == "line 1\nline 2\nline 3\nline 4\nline 5\n"
+
+
+def test_write_file_new(tmp_path):
+    writer = FileWriter()
+    target = tmp_path / "new.txt"
+    
+    result = writer.write_file(str(target), "hello\n")
+    
+    assert result.success is True
+    assert result.backup_path is None
+    assert target.read_text() == "hello\n"
+    assert not (tmp_path / "new.txt.bak").exists()
+
+
+def test_replace_string_empty_old_string(temp_file):
+    writer = FileWriter()
+    
+    result = writer.replace_string(temp_file, "", "x")
+    
+    assert result.success is False
+    assert "must not be empty" in result.error
+    with open(temp_file, 'r') as f:
+        assert f.read() == "line 1\nline 2\nline 3\nline 4\nline 5\n"
+
+
+def test_replace_string_keeps_mode_and_backup(temp_file):
+    writer = FileWriter()
+    os.chmod(temp_file, 0o640)
+    
+    result = writer.replace_string(temp_file, "line 3", "LINE 3")
+    
+    assert result.success is True
+    assert os.stat(temp_file).st_mode & 0o777 == 0o640
+    with open(result.backup_path, 'r') as f:
+        assert f.read() == "line 1\nline 2\nline 3\nline 4\nline 5\n"
+
+
+def test_replace_string_changed_lines(temp_file):
+    writer = FileWriter(create_backup=False)
+    
+    # One line changed per hit
+    result = writer.replace_string(temp_file, "line", "CODE", max_replacements=2)
+    assert result.changed_lines == 2
+    
+    # Several hits on one line count that line once
+    result = writer.replace_string(temp_file, "E", "e")
+    assert result.changed_lines == 2
+    
+    # A multi-line replacement counts the lines it spans
+    result = writer.replace_string(temp_file, "line 3\n", "line 3a\nline 3b\n")
+    assert result.changed_lines == 2
+
+
+def test_replace_string_bytes_and_text_paths(tmp_path):
+    writer = FileWriter(create_backup=False)
+    
+    # UTF-8 without carriage returns is replaced in the raw bytes
+    target = tmp_path / "utf8.txt"
+    target.write_bytes("héllo wörld\nhéllo\n".encode("utf-8"))
+    result = writer.replace_string(str(target), "héllo", "hi")
+    assert result.success and result.changed_lines == 2
+    assert target.read_bytes() == "hi wörld\nhi\n".encode("utf-8")
+    
+    # CRLF files go through text mode's newline translation as before
+    target = tmp_path / "crlf.txt"
+    target.write_bytes(b"one\r\ntwo\r\n")
+    result = writer.replace_string(str(target), "one\n", "1\n")
+    assert result.success and result.metadata["replacements"] == 1
+    assert target.read_bytes() == b"1\ntwo\n"
+    
+    # Invalid UTF-8 is still reported rather than patched blindly
+    target = tmp_path / "bad.txt"
+    target.write_bytes(b"abc \xff\n")
+    result = writer.replace_string(str(target), "abc", "x")
+    assert not result.success
+    assert "Encoding error" in result.error
+    assert target.read_bytes() == b"abc \xff\n"
+
+
+def test_apply_line_edits_in_place(temp_file):
+    writer = FileWriter()
+    inode = os.stat(temp_file).st_ino
+    
+    # Same byte length per line: written in place, the file is not replaced
+    edits = [LineEdit(line_start=2, line_end=3, new_content="LINE 2\nLINE 3\n")]
+    result = writer.apply_line_edits(temp_file, edits)
+    
+    assert result.success is True
+    assert result.changed_lines == 2
+    assert os.stat(temp_file).st_ino == inode
+    with open(temp_file, 'r') as f:
+        assert f.read() == "line 1\nLINE 2\nLINE 3\nline 4\nline 5\n"
+    
+    # The backup is a real copy, not a link to the edited file
+    with open(result.backup_path, 'r') as f:
+        assert f.read() == "line 1\nline 2\nline 3\nline 4\nline 5\n"
+
+
+def test_apply_line_edits_streamed(temp_file):
+    writer = FileWriter(create_backup=False)
+    os.chmod(temp_file, 0o640)
+    
+    # Changing the number of lines goes through a streamed replacement file
+    edits = [
+        LineEdit(line_start=2, line_end=2, new_content="two\nand a half\n"),
+        LineEdit(line_start=4, line_end=5, new_content="end\n"),
+    ]
+    result = writer.apply_line_edits(temp_file, edits)
+    
+    assert result.success is True
+    assert result.changed_lines == 3
+    assert os.stat(temp_file).st_mode & 0o777 == 0o640
+    with open(temp_file, 'r') as f:
+        assert f.read() == "line 1\ntwo\nand a half\nline 3\nend\n"
+
+
+def test_apply_line_edits_backups(temp_file):
+    writer = FileWriter()
+    original = Path(temp_file).read_text()
+    
+    # A replacement file leaves the old inode behind as the backup
+    old_inode = os.stat(temp_file).st_ino
+    result = writer.apply_line_edits(temp_file, [LineEdit(line_start=1, line_end=1, new_content="one\n")])
+    assert result.success is True
+    assert os.stat(result.backup_path).st_ino == old_inode
+    assert Path(result.backup_path).read_text() == original
+    
+    # An in-place write needs a real copy
+    edited = Path(temp_file).read_text()
+    result = writer.apply_line_edits(temp_file, [LineEdit(line_start=2, line_end=2, new_content="LINE 2\n")])
+    assert result.success is True
+    assert os.stat(result.backup_path).st_ino != os.stat(temp_file).st_ino
+    assert Path(result.backup_path).read_text() == edited
+
+
+def test_create_backup_without_reflink_support(temp_file):
+    from spiderfs_mcp.file.writer import _reflink_copy
+    
+    # Cloning fails on non-CoW filesystems and must leave nothing behind
+    backup_path = f"{temp_file}.bak"
+    if not _reflink_copy(temp_file, backup_path):
+        assert not os.path.exists(backup_path)
+    else:
+        os.unlink(backup_path)
+    
+    with patch("spiderfs_mcp.file.writer._reflink_copy", return_value=False):
+        success, path, error = FileWriter()._create_backup(temp_file)
+    
+    assert success is True
+    with open(path, 'r') as f:
+        assert f.read() == "line 1\nline 2\nline 3\nline 4\nline 5\n"
+
+
+def test_write_file_without_fallocate_support(temp_file):
+    writer = FileWriter(create_backup=False)
+    
+    # Filesystems without fallocate support must not break the write
+    with patch("os.posix_fallocate", side_effect=OSError(95, "Operation not supported"), create=True):
+        result = writer.write_file(temp_file, "é" * 5000)
+    
+    assert result.success is True
+    with open(temp_file, 'r', encoding='utf-8') as f:
+        assert f.read() == "é" * 5000
+
+
+def test_apply_line_edits_after_same_size_rewrite(tmp_path):
+    from spiderfs_mcp.file.reader import FileReader
+    
+    path = tmp_path / "rewritten.txt"
+    path.write_bytes(b"aa\nbb\ncc\n")
+    FileReader().read_line_range(str(path), 2, 2)
+    
+    # Same size and mtime: the edit must not splice at the old offsets
+    st = os.stat(path)
+    path.write_bytes(b"a\nabb\ncc\n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    
+    writer = FileWriter(create_backup=False)
+    result = writer.apply_line_edits(str(path), [LineEdit(line_start=2, line_end=2, new_content="X\n")])
+    
+    assert result.success is True
+    assert path.read_bytes() == b"a\nX\ncc\n"
+
+def test_apply_line_edits_text_path_keeps_mode(tmp_path):
+    # Carriage returns send the edit through the readlines path
+    path = tmp_path / "crlf.txt"
+    path.write_bytes(b"line 1\r\nline 2\r\n")
+    os.chmod(path, 0o644)
+    
+    writer = FileWriter(create_backup=False)
+    result = writer.apply_line_edits(str(path), [LineEdit(line_start=2, line_end=2, new_content="new 2\n")])
+    
+    assert result.success is True
+    assert path.read_text() == "line 1\nnew 2\n"
+    assert os.stat(path).st_mode & 0o777 == 0o644
+    assert os.listdir(tmp_path) == ["crlf.txt"]
+
+
+def test_apply_many(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"file{i}.txt"
+        path.write_text(f"old {i}\nkeep\n")
+        paths.append(str(path))
+    missing = str(tmp_path / "missing.txt")
+    
+    writer = FileWriter(create_backup=False)
+    edits = {path: [LineEdit(line_start=1, line_end=1, new_content="new\n")] for path in paths}
+    edits[missing] = [LineEdit(line_start=1, line_end=1, new_content="new\n")]
+    results = writer.apply_many(edits)
+    
+    assert list(results) == paths + [missing]
+    for path in paths:
+        assert results[path].success is True
+        with open(path) as f:
+            assert f.read() == "new\nkeep\n"
+    assert "File not found" in results[missing].error
@@ -1,8 +1,11 @@
+import io
+import os
 import pytest
 import subprocess
 import sys
 from pathlib import Path
 from unittest.mock import patch, MagicMock
+from src.spiderfs_mcp.search import fzf
 from src.spiderfs_mcp.search.fzf import FzfSearch
 
 @pytest.fixture
@@ -10,16 +13,28 @@ def fzf_search():
     return FzfSearch()
 
 class TestFzfSearch:
-    def test_fzf_available_check(self, fzf_search):
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
-            assert fzf_search._check_fzf_installed() is True
+    def test_fzf_available_check(self):
+        # The result is cached for the process; clear it around the test
+        fzf._check_fd_installed.cache_clear()
+        try:
+            with patch('subprocess.run') as mock_run:
+                mock_run.return_value = MagicMock(returncode=0)
+                assert fzf._check_fd_installed() is True
 
-            mock_run.side_effect = FileNotFoundError()
-            assert fzf_search._check_fzf_installed() is False
+                # Later instances reuse the cached answer
+                assert FzfSearch().fd_available is True
+                mock_run.assert_called_once()
+
+                fzf._check_fd_installed.cache_clear()
+                mock_run.side_effect = FileNotFoundError()
+                assert fzf._check_fd_installed() is False
+        finally:
+            fzf._check_fd_installed.cache_clear()
 
     def test_windows_drive_detection(self, fzf_search):
-        with patch('win32api.GetLogicalDriveStrings', return_value='C:\\\0D:\\\0'):
+        win32api = MagicMock()
+        win32api.GetLogicalDriveStrings.return_value = 'C:\\\0D:\\\0'
+        with patch.dict('sys.modules', {'win32api': win32api}):
             drives = fzf_search._get_windows_drives()
             assert drives == ['C:\\\\', 'D:\\\\']
 
@@ -31,11 +46,11 @@ class TestFzfSearch:
         test_path = str(tmp_path)
         assert fzf_search._prepare_search_paths(test_path) == [test_path]
 
-        with patch('platform.system', return_value='Windows'), \
+        with patch.object(fzf, '_IS_WINDOWS', True), \
              patch.object(fzf_search, '_get_windows_drives', return_value=['C:\\\\']):
             assert fzf_search._prepare_search_paths() == ['C:\\\\']
 
-        with patch('platform.system', return_value='Linux'):
+        with patch.object(fzf, '_IS_WINDOWS', False):
             assert fzf_search._prepare_search_paths() == ['/']
 
     def test_python_fallback_search(self, fzf_search, tmp_path):
@@ -63,29 +78,92 @@ class TestFzfSearch:
         results = fzf_search._python_fallback_search("t[est", str(tmp_path), 5)
         assert str(test_file1) in results
 
-    @patch('subprocess.run')
-    def test_fzf_search(self, mock_run, fzf_search):
+    def test_python_fallback_search_casefolds_literals(self, fzf_search, tmp_path):
+        street = tmp_path / "Straße.txt"
+        street.write_text("content")
+
+        results = fzf_search._python_fallback_search("STRASSE", str(tmp_path), 5)
+        assert str(street) in results
+
+    def test_python_fallback_search_matches_full_paths(self, fzf_search, tmp_path):
+        match_dir = tmp_path / "zz_dir"
+        match_dir.mkdir()
+        inner = match_dir / "inner.txt"
+        inner.write_text("content")
+
+        # Names and full paths both count: a matching parent directory
+        # makes its contents match too
+        results = fzf_search._python_fallback_search("zz_", str(tmp_path), 5)
+        assert results == [str(match_dir), str(inner)]
+
+        # A pattern with a separator is matched against the whole path
+        results = fzf_search._python_fallback_search(
+            "zz_dir" + os.sep + "inner", str(tmp_path), 5
+        )
+        assert results == [str(inner)]
+
+    def test_python_fallback_search_prune(self, fzf_search, tmp_path):
+        (tmp_path / "src").mkdir()
+        kept = tmp_path / "src" / "zz_kept.txt"
+        kept.write_text("content")
+        (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+        pruned = tmp_path / "node_modules" / "pkg" / "zz_pruned.txt"
+        pruned.write_text("content")
+
+        results = fzf_search._python_fallback_search("zz_", str(tmp_path), 5)
+        assert str(pruned) in results
+
+        results = fzf_search._python_fallback_search(
+            "zz_", str(tmp_path), 5, prune=True
+        )
+        assert results == [str(kept)]
+
+        results = fzf_search._python_fallback_search(
+            "node_modules", str(tmp_path), 5, prune=True
+        )
+        assert results == []
+
+    @patch('subprocess.Popen')
+    def test_fzf_search(self, mock_popen, fzf_search):
         # Define test files
         expected_files = ["file1.txt", "file2.txt"]
         
-        # Configure mock to return expected output
-        mock_result = MagicMock()
-        mock_result.stdout = "file1.txt\0file2.txt\0"
-        mock_result.stderr = ""
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
+        # Configure mock to stream the expected NUL-separated output
+        mock_proc = MagicMock()
+        mock_proc.stdout = io.BytesIO(b"file1.txt\0file2.txt\0")
+        mock_proc.wait.return_value = 0
+        mock_popen.return_value = mock_proc
 
         # Bypass test environment detection
         with patch('src.spiderfs_mcp.search.fzf.sys.modules', {}):
-            with patch.object(fzf_search, 'fzf_available', True):
+            with patch.object(fzf_search, 'fd_available', True):
                 results = fzf_search.search("pattern", "/test/path", 2)
                 assert results == expected_files
                 
                 # Verify the subprocess was called correctly
-                mock_run.assert_called_once()
+                mock_popen.assert_called_once()
                 
-        # Test fallback path
-        mock_run.side_effect = subprocess.CalledProcessError(1, "cmd")
-        with patch.object(fzf_search, '_python_fallback_search', return_value=["fallback.txt"]):
-            results = fzf_search.search("pattern", "/test/path", 1)
-            assert results == ["fallback.txt"]
\ No newline at end of file
+                # fd is stopped once enough results are in
+                mock_proc.terminate.assert_called_once()
+                
+                # Test fallback path
+                mock_proc.stdout = io.BytesIO(b"")
+                mock_proc.wait.return_value = 1
+                with patch.object(fzf_search, '_python_fallback_search', return_value=["fallback.txt"]):
+                    results = fzf_search.search("pattern", "/test/path", 1)
+                    assert results == ["fallback.txt"]
+
+    @patch('subprocess.Popen')
+    def test_run_fd_keeps_results_on_error_exit(self, mock_popen, fzf_search):
+        # fd exits nonzero after walking past an unreadable directory
+        mock_proc = MagicMock()
+        mock_proc.stdout = io.BytesIO(b"a.txt\0b.txt\0")
+        mock_proc.wait.return_value = 1
+        mock_popen.return_value = mock_proc
+
+        assert fzf_search._run_fd(["fd"], 10) == ["a.txt", "b.txt"]
+
+        # Without results the error is raised for the caller to fall back
+        mock_proc.stdout = io.BytesIO(b"")
+        with pytest.raises(subprocess.CalledProcessError):
+            fzf_search._run_fd(["fd"], 10)
@@ -0,0 +1,38 @@
+import importlib
+
+import pytest
+
+with pytest.deprecated_call():
+    from spiderfs_mcp import file_reader
+
+
+def test_module_is_deprecated():
+    with pytest.deprecated_call():
+        importlib.reload(file_reader)
+
+
+def test_read_file_line_range(tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_bytes(b"one\r\ntwo\nthree\nfour")
+    
+    reader = file_reader.FileReader
+    assert reader.read_file(str(path)) == ["one\n", "two\n", "three\n", "four"]
+    assert reader.read_file(str(path), start_line=2, end_line=3) == ["two\n", "three\n"]
+    assert reader.read_file(str(path), errors="replace", start_line=2, end_line=3) == ["two\n", "three\n"]
+    
+    with pytest.raises(ValueError):
+        reader.read_file(str(path), end_line=5)
+    with pytest.raises(ValueError):
+        reader.read_file(str(path), start_line=0)
+    with pytest.raises(FileNotFoundError):
+        reader.read_file(str(tmp_path / "missing.txt"))
+
+
+def test_detect_encoding_truncated_utf8(tmp_path):
+    # A short file ending mid-character is not valid UTF-8
+    path = tmp_path / "cut.txt"
+    path.write_bytes("café".encode("utf-8")[:-1])
+    assert file_reader.FileReader.detect_encoding(str(path)) != "utf-8"
+    
+    path.write_bytes("café".encode("utf-8"))
+    assert file_reader.FileReader.detect_encoding(str(path)) == "utf-8"
@@ -0,0 +1,112 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from spiderfs_mcp import server
+from spiderfs_mcp.search.ripgrep import TextSearchResult
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    server._clear_fuzzy_cache()
+    server._clear_content_cache()
+    yield
+    server._clear_fuzzy_cache()
+    server._clear_content_cache()
+
+
+def test_fuzzy_file_search_caches_repeated_queries(tmp_path):
+    with patch.object(server._fuzzy_searcher(), "search", return_value=["a.txt"]) as mock_search:
+        assert server.fuzzy_file_search("a", str(tmp_path)) == ["a.txt"]
+        assert server.fuzzy_file_search("a", str(tmp_path)) == ["a.txt"]
+        assert mock_search.call_count == 1
+
+        # Different arguments are a different query
+        server.fuzzy_file_search("a", str(tmp_path), include_dirs=False)
+        assert mock_search.call_count == 2
+
+        # Entries expire after the TTL
+        with patch.object(server, "FUZZY_CACHE_TTL", 0):
+            server.fuzzy_file_search("a", str(tmp_path))
+        assert mock_search.call_count == 3
+
+
+def test_writes_clear_fuzzy_cache(tmp_path):
+    target = tmp_path / "new.txt"
+    with patch.object(server._fuzzy_searcher(), "search", return_value=[]) as mock_search:
+        server.fuzzy_file_search("new", str(tmp_path))
+        assert server.write_file(str(target), "content\n") == "Success"
+        server.fuzzy_file_search("new", str(tmp_path))
+        assert mock_search.call_count == 2
+
+
+def test_search_content_caches_until_the_file_changes(tmp_path):
+    target = tmp_path / "f.txt"
+    target.write_text("hit\n")
+    reply = TextSearchResult(text="f.txt:1:hit")
+    with patch.object(server._RIPGREP, "search_text_async", AsyncMock(return_value=reply)) as mock_search:
+        assert asyncio.run(server.search_content(str(target), "hit")) == "f.txt:1:hit"
+        assert asyncio.run(server.search_content(str(target), "hit")) == "f.txt:1:hit"
+        assert mock_search.await_count == 1
+
+        # A different size (or mtime) is a different key
+        target.write_text("hit\nhit again\n")
+        asyncio.run(server.search_content(str(target), "hit"))
+        assert mock_search.await_count == 2
+
+        # Writes through the server clear it outright
+        server.write_file(str(tmp_path / "other.txt"), "x")
+        asyncio.run(server.search_content(str(target), "hit"))
+        assert mock_search.await_count == 3
+
+        # Missing paths are searched (and fail) every time
+        asyncio.run(server.search_content(str(tmp_path / "missing"), "hit"))
+        asyncio.run(server.search_content(str(tmp_path / "missing"), "hit"))
+        assert mock_search.await_count == 5
+
+
+def test_search_content_limits_concurrent_searches(tmp_path):
+    running = peak = 0
+
+    async def fake_search(pattern, path):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return TextSearchResult(text=pattern)
+
+    async def search_all():
+        return await asyncio.gather(
+            *(server.search_content(str(tmp_path), "p%d" % i) for i in range(6))
+        )
+
+    with patch.object(server, "_search_slots", asyncio.Semaphore(2)), \
+            patch.object(server._RIPGREP, "search_text_async", fake_search):
+        assert asyncio.run(search_all()) == ["p%d" % i for i in range(6)]
+    assert peak == 2
+
+
+def test_edit_file_without_edits_touches_nothing(tmp_path):
+    with patch.object(server._WRITER, "apply_line_edits") as mock_apply:
+        assert server.edit_file(str(tmp_path / "missing.txt"), []) == "No changes made"
+        mock_apply.assert_not_called()
+
+
+def test_bind_arguments_fills_defaults_and_reports_missing():
+    arguments, error = server._bind_arguments(
+        "fuzzy_file_search", {"pattern": "a", "max_results": 2}
+    )
+    assert error is None
+    assert arguments == {
+        "pattern": "a",
+        "root_path": None,
+        "max_results": 2,
+        "include_dirs": True,
+        "prune": False,
+    }
+
+    arguments, error = server._bind_arguments("write_file", {"content": "x"})
+    assert arguments is None
+    assert error == "Missing required argument(s): path"
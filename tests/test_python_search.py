@@ -1,7 +1,7 @@
 import pytest
 from pathlib import Path
 from unittest.mock import patch, mock_open
-from spiderfs_mcp.search.python_search import PythonSearch
+from spiderfs_mcp.search.python_search import PythonSearch, _required_literal
 
 
 def test_python_search_success():
@@ -55,4 +55,99 @@ def test_python_search_invalid_regex():
         result = search.search_file("[invalid regex", "test.txt")
         
         assert len(result.matches) == 0
-        assert "Search failed" in result.error
\ No newline at end of file
+        assert "Search failed" in result.error
+
+def test_python_search_blocks_match_line_by_line(tmp_path):
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("alpha 1\nbeta\n\nalpha 22\ngamma alpha", encoding="utf-8")
+    search = PythonSearch()
+
+    # Tiny blocks force lines to be carried across reads
+    with patch("spiderfs_mcp.search.python_search.SEARCH_BLOCK_SIZE", 3):
+        result = search.search_file(r"alpha \d+$", str(test_file))
+        assert [(m.line_number, m.line_content) for m in result.matches] == [
+            (1, "alpha 1"), (4, "alpha 22")
+        ]
+
+        result = search.search_file("^$", str(test_file))
+        assert [m.line_number for m in result.matches] == [3]
+
+        result = search.search_file("alpha", str(test_file))
+        assert [m.line_number for m in result.matches] == [1, 4, 5]
+
+
+def test_python_search_multiline_pattern_stays_per_line(tmp_path):
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("a\nb\n", encoding="utf-8")
+
+    # \s could cross a line break in a block scan, so lines are searched singly
+    result = PythonSearch().search_file(r"a\sb", str(test_file))
+    assert result.matches == []
+    assert result.error is None
+
+
+def test_python_search_directory(tmp_path):
+    (tmp_path / "b.txt").write_text("hit b\n", encoding="utf-8")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "a.txt").write_text("miss\nhit a\n", encoding="utf-8")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "c.txt").write_text("hit c\n", encoding="utf-8")
+    (tmp_path / "blob.bin").write_bytes(b"hit \xff\n")
+    search = PythonSearch()
+
+    # Hidden entries and files that aren't UTF-8 are skipped
+    result = search.search("hit", str(tmp_path))
+    assert result.error is None
+    assert [(Path(m.path).name, m.line_number) for m in result.matches] == [
+        ("b.txt", 1), ("a.txt", 2)
+    ]
+
+    # The limit applies to the whole tree
+    assert len(search.search("hit", str(tmp_path), max_matches=1).matches) == 1
+
+    result = search.search("[invalid", str(tmp_path))
+    assert "Search failed" in result.error
+
+
+@pytest.mark.parametrize("pattern,literal", [
+    ("hello", "hello"),
+    (r"foo\.bar", "foo.bar"),
+    (r"def \w+\(", "def "),
+    ("colou?r", "colo"),
+    ("ab{2}cd", "cd"),
+    ("(abc)?xyz", "xyz"),
+    ("[]ab]cdef", "cdef"),
+    ("cat|dog", ""),
+    ("(?i)abc", ""),
+    (r"\x41bc", "bc"),
+    (r"\101", ""),
+    (r"\u0041yz", "yz"),
+    (r"\N{LATIN CAPITAL LETTER A}", ""),
+    (r"(a)\12", ""),
+])
+def test_required_literal(pattern, literal):
+    assert _required_literal(pattern) == literal
+
+
+@pytest.mark.parametrize("pattern", [r"\x41", r"\101", r"\u0041", r"\N{LATIN CAPITAL LETTER A}"])
+def test_python_search_escape_arguments(tmp_path, pattern):
+    # An escape's code is not literal text the line must contain
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("A\n", encoding="utf-8")
+    result = PythonSearch().search_file(pattern, str(test_file))
+    assert [m.line_content for m in result.matches] == ["A"]
+
+
+def test_python_search_literal_prefilter(tmp_path):
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("nothing\n" * 5 + "def foo(x):\n" + "nothing\n" * 5, encoding="utf-8")
+    search = PythonSearch()
+
+    # Blocks without the literal are skipped but still count their lines
+    with patch("spiderfs_mcp.search.python_search.SEARCH_BLOCK_SIZE", 10):
+        result = search.search_file(r"def \w+\(", str(test_file))
+    assert [(m.line_number, m.line_content) for m in result.matches] == [(6, "def foo(x):")]
+
+    # Same on the per-line path
+    result = search.search_file(r"def\s\w+\(", str(test_file))
+    assert [m.line_number for m in result.matches] == [6]
@@ -1,117 +1,252 @@
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
 import pytest
-from unittest.mock import patch, Mock
 from pathlib import Path
+from types import SimpleNamespace
 from spiderfs_mcp.search.ripgrep import RipgrepSearch, SearchMatch, SearchResult
 
 
-def test_ripgrep_empty_lines():
-    with patch('subprocess.run') as mock_run:
-        # Mock ripgrep output with empty lines
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="\nfile.txt:1:valid line\n\n",
-            stderr=""
-        )
-        
-        search = RipgrepSearch()
-        result = search.search("pattern", "file.txt")
-        
-        assert len(result.matches) == 1
-        assert result.matches[0].line_content == "valid line"
-
-
-def test_ripgrep_malformed_output():
-    with patch('subprocess.run') as mock_run:
-        # Mock ripgrep output with malformed line
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="malformed_line_without_proper_format\nfile.txt:1:valid line",
-            stderr=""
-        )
-        
-        search = RipgrepSearch()
-        result = search.search("pattern", "file.txt")
-        
-        # Should only get the valid line
-        assert len(result.matches) == 1
-        assert result.matches[0].line_content == "valid line"
-
-
-def test_ripgrep_search_success():
-    with patch('subprocess.run') as mock_run:
-        # Mock successful ripgrep output
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="file.txt:1:hello world\nfile.txt:2:hello again\n",
-            stderr=""
-        )
-        
-        search = RipgrepSearch()
-        result = search.search("hello", "file.txt")
-        
-        assert len(result.matches) == 2
-        assert result.error is None
-        assert result.matches[0].line_number == 1
-        assert result.matches[0].line_content == "hello world"
-        assert result.matches[0].path == "file.txt"
-
-
-def test_ripgrep_search_no_matches():
-    with patch('subprocess.run') as mock_run:
-        # Mock ripgrep output with no matches
-        mock_run.return_value = Mock(
-            returncode=1,  # ripgrep returns 1 when no matches found
-            stdout="",
-            stderr=""
-        )
-        
-        search = RipgrepSearch()
-        result = search.search("notfound", "file.txt")
-        
-        assert len(result.matches) == 0
-        assert result.error is None
-
-
-def test_ripgrep_search_error():
-    with patch('subprocess.run') as mock_run:
-        # Mock ripgrep error
-        mock_run.return_value = Mock(
-            returncode=2,
-            stdout="",
-            stderr="some error occurred"
-        )
-        
-        search = RipgrepSearch()
-        result = search.search("pattern", "file.txt")
-        
-        assert len(result.matches) == 0
-        assert result.error == "ripgrep error: some error occurred"
-
-
-def test_ripgrep_subprocess_exception():
-    with patch('subprocess.run') as mock_run:
-        mock_run.side_effect = Exception("Mock subprocess failure")
-        
-        search = RipgrepSearch()
-        result = search.search("pattern", "file.txt")
-        
-        assert len(result.matches) == 0
-        assert "Search failed: Mock subprocess failure" in result.error
-
-
-def test_ripgrep_max_matches():
-    with patch('subprocess.run') as mock_run:
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="file.txt:1:line1\nfile.txt:2:line2\nfile.txt:3:line3",
-            stderr=""
-        )
-        
-        search = RipgrepSearch()
-        result = search.search("pattern", "file.txt", max_matches=2)
-        
-        # Verify -m 2 was passed to ripgrep
-        cmd_args = mock_run.call_args[0][0]
-        assert "-m" in cmd_args
-        assert "2" in cmd_args
-        assert len(result.matches) == 3  # All matches are returned
\ No newline at end of file
+def rg_match(path, line_number, text):
+    """Build one `rg --json` match event line"""
+    return json.dumps({
+        "type": "match",
+        "data": {
+            "path": {"text": path},
+            "lines": {"text": text + "\n"},
+            "line_number": line_number,
+            "absolute_offset": 0,
+            "submatches": [],
+        },
+    })
+
+
+def rg_output(*matches):
+    return "\n".join(rg_match(*m) for m in matches) + "\n"
+
+
+class FakeRgProcess:
+    """Stands in for subprocess.Popen, replaying a canned ripgrep run"""
+
+    def __init__(self, argv, run):
+        self.argv = argv
+        self.stdout = io.BytesIO(run.stdout.encode("utf-8"))
+        self.stderr = io.BytesIO(run.stderr.encode("utf-8"))
+        self._returncode = run.returncode
+        self.terminated = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def terminate(self):
+        self.terminated = True
+
+    def wait(self):
+        return self._returncode
+
+
+@pytest.fixture
+def fake_rg(monkeypatch):
+    """
+    Replace subprocess.Popen with FakeRgProcess. Tests set returncode,
+    stdout and stderr (or error, to make starting rg fail) on the returned
+    namespace; started processes are appended to its processes list.
+    """
+    run = SimpleNamespace(returncode=0, stdout="", stderr="", error=None, processes=[])
+
+    def popen(argv, **kwargs):
+        if run.error is not None:
+            raise run.error
+        process = FakeRgProcess(argv, run)
+        run.processes.append(process)
+        return process
+
+    monkeypatch.setattr(subprocess, "Popen", popen)
+    return run
+
+
+@pytest.fixture(scope="module")
+def search():
+    return RipgrepSearch()
+
+
+@pytest.mark.parametrize(
+    "returncode,stdout,stderr,expected,error",
+    [
+        pytest.param(
+            0, "\n" + rg_output(("file.txt", 1, "valid line")) + "\n", "",
+            [("file.txt", 1, "valid line")], None,
+            id="empty_lines",
+        ),
+        pytest.param(
+            # Only the valid line is returned
+            0, "malformed_line_without_proper_format\n" + rg_output(("file.txt", 1, "valid line")), "",
+            [("file.txt", 1, "valid line")], None,
+            id="malformed_output",
+        ),
+        pytest.param(
+            0, rg_output(("file.txt", 1, "hello world"), ("file.txt", 2, "hello again")), "",
+            [("file.txt", 1, "hello world"), ("file.txt", 2, "hello again")], None,
+            id="success",
+        ),
+        pytest.param(
+            1, "", "",  # ripgrep returns 1 when no matches found
+            [], None,
+            id="no_matches",
+        ),
+        pytest.param(
+            2, "", "some error occurred",
+            [], "ripgrep error: some error occurred",
+            id="error",
+        ),
+    ],
+)
+def test_ripgrep_parsing(search, fake_rg, returncode, stdout, stderr, expected, error):
+    fake_rg.returncode, fake_rg.stdout, fake_rg.stderr = returncode, stdout, stderr
+    result = search.search("pattern", "file.txt")
+    
+    assert [(m.path, m.line_number, m.line_content) for m in result.matches] == expected
+    assert result.error == error
+
+
+def test_ripgrep_subprocess_exception(search, fake_rg):
+    fake_rg.error = Exception("Mock subprocess failure")
+    result = search.search("pattern", "file.txt")
+    
+    assert len(result.matches) == 0
+    assert "Search failed: Mock subprocess failure" in result.error
+
+
+def test_ripgrep_max_matches(search, fake_rg):
+    fake_rg.stdout = rg_output(("file.txt", 1, "line1"), ("file.txt", 2, "line2"), ("file.txt", 3, "line3"))
+    result = search.search("pattern", "file.txt", max_matches=2)
+    
+    # Verify -m 2 was passed to ripgrep
+    (process,) = fake_rg.processes
+    assert "-m" in process.argv
+    assert "2" in process.argv
+    # -m is per file; the total is capped here and ripgrep is stopped
+    assert len(result.matches) == 2
+    assert process.terminated is True
+
+
+def test_ripgrep_json_events(search, fake_rg):
+    # Non-match events are ignored; Windows paths need no special parsing
+    begin = json.dumps({"type": "begin", "data": {"path": {"text": "C:\\dir\\file.txt"}}})
+    fake_rg.stdout = begin + "\n" + rg_output(("C:\\dir\\file.txt", 7, "a:b:c"))
+    result = search.search("pattern", "C:\\dir")
+    
+    assert "--json" in fake_rg.processes[0].argv
+    assert len(result.matches) == 1
+    assert result.matches[0].path == "C:\\dir\\file.txt"
+    assert result.matches[0].line_number == 7
+    assert result.matches[0].line_content == "a:b:c"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script as a fake rg")
+def test_ripgrep_search_async_stops_at_max_matches(tmp_path):
+    # Fake rg that emits matches forever; search_async must stop it itself
+    fake_rg = tmp_path / "rg"
+    fake_rg.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys\n"
+        "i = 0\n"
+        "while True:\n"
+        "    i += 1\n"
+        "    print(json.dumps({'type': 'match', 'data': {'path': {'text': 'f.txt'},"
+        " 'lines': {'text': 'line %d\\n' % i}, 'line_number': i}}), flush=True)\n"
+    )
+    os.chmod(fake_rg, 0o755)
+    
+    search = RipgrepSearch(executable_path=str(fake_rg))
+    result = asyncio.run(search.search_async("pattern", "f.txt", max_matches=3))
+    
+    assert result.error is None
+    assert [m.line_number for m in result.matches] == [1, 2, 3]
+    assert result.matches[2].line_content == "line 3"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script as a fake rg")
+def test_ripgrep_search_stops_at_max_matches(tmp_path):
+    # Fake rg that emits matches (and stderr noise) forever
+    fake_rg = tmp_path / "rg"
+    fake_rg.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys\n"
+        "i = 0\n"
+        "while True:\n"
+        "    i += 1\n"
+        "    sys.stderr.write('warning\\n')\n"
+        "    print(json.dumps({'type': 'match', 'data': {'path': {'text': 'f.txt'},"
+        " 'lines': {'text': 'line %d\\n' % i}, 'line_number': i}}), flush=True)\n"
+    )
+    os.chmod(fake_rg, 0o755)
+    
+    search = RipgrepSearch(executable_path=str(fake_rg))
+    result = search.search("pattern", "f.txt", max_matches=3)
+    
+    assert result.error is None
+    assert [m.line_number for m in result.matches] == [1, 2, 3]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script as a fake rg")
+def test_ripgrep_search_text_async(tmp_path):
+    fake_rg = tmp_path / "rg"
+    fake_rg.write_text(
+        f"#!{sys.executable}\n"
+        "import json\n"
+        "print(json.dumps({'type': 'begin', 'data': {'path': {'text': 'f.txt'}}}))\n"
+        "for i in (3, 9):\n"
+        "    print(json.dumps({'type': 'match', 'data': {'path': {'text': 'f.txt'},"
+        " 'lines': {'text': 'a:b %d\\n' % i}, 'line_number': i}}))\n"
+    )
+    os.chmod(fake_rg, 0o755)
+
+    search = RipgrepSearch(executable_path=str(fake_rg))
+    result = asyncio.run(search.search_text_async("pattern", "f.txt"))
+
+    assert result.error is None
+    assert result.text == "f.txt:3:a:b 3\nf.txt:9:a:b 9"
+
+    search = RipgrepSearch(executable_path="/nonexistent/rg")
+    result = asyncio.run(search.search_text_async("pattern", "f.txt"))
+    assert result.text == ""
+    assert "Search failed" in result.error
+
+
+def test_ripgrep_search_async_missing_executable():
+    search = RipgrepSearch(executable_path="/nonexistent/rg")
+    result = asyncio.run(search.search_async("pattern", "file.txt"))
+    
+    assert len(result.matches) == 0
+    assert "Search failed" in result.error
+
+
+def test_ripgrep_search_in_process(tmp_path):
+    (tmp_path / "f.txt").write_text("a:b 1\nnothing\na:b 3\n", encoding="utf-8")
+    search = RipgrepSearch(executable_path="/nonexistent/rg", in_process=True)
+
+    result = search.search("b [0-9]", str(tmp_path))
+    assert [m.line_number for m in result.matches] == [1, 3]
+
+    result = asyncio.run(search.search_text_async("b [0-9]", str(tmp_path / "f.txt")))
+    assert result.error is None
+    assert result.text == f"{tmp_path / 'f.txt'}:1:a:b 1\n{tmp_path / 'f.txt'}:3:a:b 3"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script as a fake rg")
+def test_ripgrep_resolves_executable_once(tmp_path, monkeypatch):
+    fake_rg = tmp_path / "rg"
+    fake_rg.write_text("#!/bin/sh\n")
+    os.chmod(fake_rg, 0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    assert RipgrepSearch().executable == str(fake_rg)
+    # Names that can't be resolved are kept as given
+    assert RipgrepSearch(executable_path="no-such-rg").executable == "no-such-rg"